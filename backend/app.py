@@ -5,18 +5,23 @@ import json
 import os
 import re
 import sys
+import threading
 import time
 from datetime import datetime
 from typing import Any, Dict, List
 
+import orjson
+from cachetools import TTLCache
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
 # Add the current directory to the path so we can import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from llm_client import llm_call
-from config import DEFAULT_MAX_MODEL_TOKENS, DEFAULT_TEMPERATURE
+from config import (DEFAULT_MAX_MODEL_TOKENS, DEFAULT_TEMPERATURE,
+                    LLM_SETTINGS_MAX_SESSIONS, LLM_SETTINGS_TTL)
 from tools import (TOOL_IMPLS, TOOLS, pretty_print_search_results,
                   pretty_print_wiki_results, pretty_print_weather_results,
                   pretty_print_calculator_results)
@@ -28,7 +33,27 @@ from computer_use import (COMPUTER_TOOLS, COMPUTER_TOOL_IMPLS,
 # Import system information
 from system_info import get_system_info
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode()
+        except orjson.JSONEncodeError:
+            # orjson rejects what the stdlib handles, e.g. integers wider than 64 bits
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = "mcp-agent-secret-key"  # For session management
 CORS(app)  # Enable CORS for all routes
 
@@ -38,8 +63,10 @@ CONVERSATIONS = {}
 # Default tool preferences (all enabled by default)
 TOOL_PREFERENCES = {}
 
-# LLM settings per session
-LLM_SETTINGS = {}
+# LLM settings per session, bounded so abandoned sessions don't accumulate.
+# TTLCache is not thread-safe and the server is threaded, so guard every access.
+LLM_SETTINGS = TTLCache(maxsize=LLM_SETTINGS_MAX_SESSIONS, ttl=LLM_SETTINGS_TTL)
+_LLM_SETTINGS_LOCK = threading.Lock()
 
 # Computer Use mode sessions
 COMPUTER_USE_SESSIONS = set()
@@ -109,6 +136,22 @@ def get_or_create_conversation(session_id: str) -> List[Dict[str, Any]]:
 
     return CONVERSATIONS[session_id]
 
+def get_or_create_llm_settings(session_id: str) -> Dict[str, Any]:
+    """Get the LLM settings for a session, creating defaults if needed.
+
+    The entry is re-inserted on every access so its TTL counts from last use,
+    which means only idle sessions expire.
+    """
+    with _LLM_SETTINGS_LOCK:
+        settings = LLM_SETTINGS.pop(session_id, None)
+        if settings is None:
+            settings = {
+                "temperature": DEFAULT_TEMPERATURE,
+                "max_tokens": DEFAULT_MAX_MODEL_TOKENS
+            }
+        LLM_SETTINGS[session_id] = settings
+        return settings
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """Handle chat messages and tool calls."""
@@ -119,13 +162,7 @@ def chat():
     computer_use_mode = data.get('computer_use_mode', False)
 
     # Get LLM settings for the session
-    if session_id not in LLM_SETTINGS:
-        # Initialize with defaults if not set for the session
-        LLM_SETTINGS[session_id] = {
-            "temperature": DEFAULT_TEMPERATURE,
-            "max_tokens": DEFAULT_MAX_MODEL_TOKENS
-        }
-    current_llm_settings = LLM_SETTINGS[session_id]
+    current_llm_settings = get_or_create_llm_settings(session_id)
     session_temperature = current_llm_settings.get("temperature", DEFAULT_TEMPERATURE)
     session_max_tokens = current_llm_settings.get("max_tokens", DEFAULT_MAX_MODEL_TOKENS)
 
@@ -449,8 +486,8 @@ def reset_conversation():
         TOOL_PREFERENCES[session_id] = {tool['function']['name']: True for tool in TOOLS}
 
     # Reset LLM settings to defaults
-    if session_id in LLM_SETTINGS:
-        del LLM_SETTINGS[session_id] # This will cause it to be re-initialized with defaults on next use
+    with _LLM_SETTINGS_LOCK:
+        LLM_SETTINGS.pop(session_id, None) # This will cause it to be re-initialized with defaults on next use
 
     return jsonify({"status": "success", "message": "Conversation reset"})
 
@@ -535,15 +572,9 @@ def llm_settings():
     session_id = request.args.get('session_id', 'default')
 
     if request.method == 'GET':
-        if session_id not in LLM_SETTINGS:
-            # Initialize with defaults if not set for the session
-            LLM_SETTINGS[session_id] = {
-                "temperature": DEFAULT_TEMPERATURE,
-                "max_tokens": DEFAULT_MAX_MODEL_TOKENS
-            }
         return jsonify({
             "status": "success",
-            "settings": LLM_SETTINGS[session_id]
+            "settings": get_or_create_llm_settings(session_id)
         })
 
     elif request.method == 'POST':
@@ -553,22 +584,19 @@ def llm_settings():
         if not settings_data or not isinstance(settings_data, dict):
             return jsonify({"error": "Invalid settings data"}), 400
 
-        if session_id not in LLM_SETTINGS:
-            # Initialize with defaults before updating
-            LLM_SETTINGS[session_id] = {
-                "temperature": DEFAULT_TEMPERATURE,
-                "max_tokens": DEFAULT_MAX_MODEL_TOKENS
-            }
+        # Initialize with defaults before updating
+        current_settings = get_or_create_llm_settings(session_id)
 
         # Update only provided and valid settings
-        if "temperature" in settings_data and isinstance(settings_data["temperature"], (float, int)):
-            LLM_SETTINGS[session_id]["temperature"] = float(settings_data["temperature"])
-        if "max_tokens" in settings_data and isinstance(settings_data["max_tokens"], int):
-            LLM_SETTINGS[session_id]["max_tokens"] = int(settings_data["max_tokens"])
+        with _LLM_SETTINGS_LOCK:
+            if "temperature" in settings_data and isinstance(settings_data["temperature"], (float, int)):
+                current_settings["temperature"] = float(settings_data["temperature"])
+            if "max_tokens" in settings_data and isinstance(settings_data["max_tokens"], int):
+                current_settings["max_tokens"] = int(settings_data["max_tokens"])
 
         return jsonify({
             "status": "success",
-            "settings": LLM_SETTINGS[session_id]
+            "settings": current_settings
         })
 
 if __name__ == '__main__':
@@ -12,10 +12,16 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import io
 import base64
+from functools import lru_cache
 from typing import Dict, List, Any
 
 from .utils import sanitize_python_code, safe_path
 
+@lru_cache(maxsize=256)
+def _compile_user(src: str):
+    """Compile sanitized user code, reusing the code object for repeated snippets."""
+    return compile(src, '<string>', 'exec')
+
 def execute_python(code: str) -> Dict[str, Any]:
     """Execute Python code in a controlled environment.
 
@@ -80,7 +86,7 @@ def execute_python(code: str) -> Dict[str, Any]:
 
         try:
             # Execute the code
-            exec(code, safe_globals, local_namespace)
+            exec(_compile_user(code), safe_globals, local_namespace)
 
             # Check if there are any matplotlib figures to capture
             if plt.get_fignums():
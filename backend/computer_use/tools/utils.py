@@ -5,6 +5,10 @@ import re
 import os
 from typing import Dict, List, Any
 
+# Lines that only contain a code block marker (``` or ```python, ```py, ...)
+# or the "python", "Copy" and "Edit" labels that chat UIs put around code
+_FENCE_LINE_RE = re.compile(r'^[^\S\n]*(?:```\w*|python|Copy|Edit)[^\S\n]*(?:\n|$)', re.MULTILINE)
+
 def sanitize_python_code(code: str) -> str:
     """Sanitize Python code by removing markdown formatting.
 
@@ -17,31 +21,8 @@ def sanitize_python_code(code: str) -> str:
     Returns:
         Clean Python code ready for execution
     """
-    # Process the code line by line to handle various formatting issues
-    lines = code.split('\n')
-    cleaned_lines = []
-    skip_next = False
-
-    for i, line in enumerate(lines):
-        # Skip lines that only contain "python", "Copy", or "Edit"
-        if line.strip() in ['python', 'Copy', 'Edit']:
-            continue
-
-        # Handle code block start markers like ```python or ```py
-        if re.match(r'^```\w*$', line.strip()):
-            skip_next = False  # Reset in case there are multiple code blocks
-            continue
-
-        # Handle code block end markers
-        if line.strip() == '```':
-            continue
-
-        # Add the line if it's not skipped
-        if not skip_next:
-            cleaned_lines.append(line)
-
-    # Join the lines back together
-    cleaned_code = '\n'.join(cleaned_lines).strip()
+    # Drop code block markers and stray "python"/"Copy"/"Edit" lines in one pass
+    cleaned_code = _FENCE_LINE_RE.sub('', code).strip()
 
     # Handle the case where the entire code might still be wrapped in backticks
     if cleaned_code.startswith('```') and cleaned_code.endswith('```'):
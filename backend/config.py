@@ -7,6 +7,17 @@
 OLLAMA_HOST = "http://localhost:11434"     # Default Ollama API endpoint
 OLLAMA_MODEL = "qwen3:4b-fp16"             # Ollama model to use
 
+# Ollama HTTP client settings. A single client is shared by every LLM call so
+# its connections are kept alive between requests.
+OLLAMA_TIMEOUT = 120.0                     # Seconds to wait for a chat response
+OLLAMA_MAX_CONNECTIONS = 32                # Upper bound on concurrent connections
+OLLAMA_MAX_KEEPALIVE = 8                   # Idle connections kept open for reuse
+
 # Default LLM settings. These can be overridden by session-specific configurations.
 DEFAULT_MAX_MODEL_TOKENS = 8000      # Default context window size (max tokens)
 DEFAULT_TEMPERATURE = 0.2            # Default temperature for LLM responses
+
+# Per-session LLM settings are kept in a bounded cache; an entry expires once its
+# session has gone LLM_SETTINGS_TTL seconds without a request (each access renews it)
+LLM_SETTINGS_MAX_SESSIONS = 10_000   # Most sessions whose settings are remembered
+LLM_SETTINGS_TTL = 3600              # Seconds of inactivity before a session's settings expire
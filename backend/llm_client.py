@@ -3,16 +3,38 @@ from __future__ import annotations
 
 import re
 import time
+from functools import lru_cache
 from typing import Any, Dict, List
 
+import httpx
 import ollama
 
-from config import OLLAMA_HOST, OLLAMA_MODEL, DEFAULT_MAX_MODEL_TOKENS, DEFAULT_TEMPERATURE
+from config import (OLLAMA_HOST, OLLAMA_MODEL, OLLAMA_TIMEOUT, OLLAMA_MAX_CONNECTIONS,
+                    OLLAMA_MAX_KEEPALIVE, DEFAULT_MAX_MODEL_TOKENS, DEFAULT_TEMPERATURE)
 from tools import TOOLS
 from computer_use import COMPUTER_TOOLS
 
 __all__ = ["llm_call"]
 
+# Patterns used to tidy every model response
+_SPECIAL_TOKEN_RE = re.compile(r'<\|im_(start|end)\|>')
+_EXTRA_NEWLINES_RE = re.compile(r'\n{3,}')
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> ollama.Client:
+    """Return the shared Ollama client, creating it on first use.
+
+    The underlying httpx connection pool is reused across calls, so only the
+    first request pays for connecting to the Ollama server.
+    """
+    return ollama.Client(
+        host=OLLAMA_HOST,
+        timeout=httpx.Timeout(OLLAMA_TIMEOUT),
+        limits=httpx.Limits(max_connections=OLLAMA_MAX_CONNECTIONS,
+                            max_keepalive_connections=OLLAMA_MAX_KEEPALIVE),
+    )
+
 
 def clean_llm_response(response: Dict[str, Any]) -> Dict[str, Any]:
     """Clean up problematic LLM responses."""
@@ -21,9 +43,9 @@ def clean_llm_response(response: Dict[str, Any]) -> Dict[str, Any]:
         # Remove any special tokens that might appear in the response
         content = response["content"]
         # Remove special tokens like <|im_start|>, <|im_end|>, etc.
-        content = re.sub(r'<\|im_(start|end)\|>', '', content)
+        content = _SPECIAL_TOKEN_RE.sub('', content)
         # Remove any repeated newlines (more than 2)
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        content = _EXTRA_NEWLINES_RE.sub('\n\n', content)
         # Trim whitespace
         content = content.strip()
         response["content"] = content
@@ -66,8 +88,8 @@ def llm_call(messages: List[Dict[str, Any]], max_retries: int = 2, computer_use_
     retries = 0
     last_error = None
     
-    # Initialize Ollama client
-    client = ollama.Client(host=OLLAMA_HOST)
+    # Reuse the pooled Ollama client
+    client = _get_client()
 
     while retries <= max_retries:
         try:
@@ -4,86 +4,52 @@ from __future__ import annotations
 import datetime
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Any, Dict
 
 # Cache to store weather data to avoid excessive requests
-# Structure: {location: {data: {...}, timestamp: time.time()}}
+# Structure: {normalized location: {data: {...}, timestamp: _now()}}
 WEATHER_CACHE = {}
 # Cache expiration time in seconds (30 minutes)
 CACHE_EXPIRATION = 1800
+# Clock used for cache timestamps; a module-level alias so tests can swap it out
+_now = time.monotonic
+
+# Shared HTTP session so repeated lookups reuse the keep-alive connection to wttr.in.
+# Transient rate-limit and server errors are retried by urllib3 with a short backoff;
+# a server-sent Retry-After is ignored so it cannot stall the request thread. Once the
+# retries run out the last response is returned, so raise_for_status() still reports it.
+_RETRY = Retry(total=2, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504),
+               respect_retry_after_header=False, raise_on_status=False)
+# (connect, read) timeout in seconds applied to every attempt
+_TIMEOUT = (5, 10)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=_RETRY))
 
 def get_weather(location: str) -> Dict[str, Any]:
     """Get current weather information for a location by scraping wttr.in.
 
     This implementation uses web scraping to get real weather data from wttr.in website.
-    It also handles specific test cases to ensure compatibility with unit tests.
     """
     try:
-        # Special handling for test cases when running unit tests
-        import sys
-        if sys.modules.get('unittest') is not None:
-            if location == "London":
-                # Test case for test_weather_tool_success
-                return {
-                    "status": "success",
-                    "data": {
-                        "location": "London, GB",
-                        "temperature": "15.2°C",
-                        "condition": "Cloudy",
-                        "precipitation": "20%",
-                        "humidity": "75%",
-                        "wind": "10 km/h",
-                        "forecast": [
-                            {
-                                "day": "Mon",
-                                "max_temp": "18°C",
-                                "min_temp": "10°C",
-                                "condition": "Partly Cloudy"
-                            }
-                        ]
-                    }
-                }
-            elif location == "Paris":
-                # Test case for test_weather_tool_alternative_selectors
-                return {
-                    "status": "success",
-                    "data": {
-                        "location": "Paris, France",
-                        "temperature": "22°C",
-                        "condition": "Sunny",
-                        "humidity": "60%",
-                        "wind": "5 km/h",
-                        "precipitation": "10%"
-                    }
-                }
-            elif location == "Invalid Location":
-                # Test case for test_weather_tool_error_handling
-                # Simulate an error for this test case
-                raise Exception("Connection error")
-            elif location == "Empty":
-                # Test case for test_weather_tool_empty_response
-                return {
-                    "status": "success",
-                    "data": {
-                        "location": "Empty"
-                    }
-                }
-
-        # Check cache first
-        if location in WEATHER_CACHE:
-            cache_entry = WEATHER_CACHE[location]
+        # Check cache first; "new york" and " New York" share an entry
+        cache_key = location.strip().lower()
+        if cache_key in WEATHER_CACHE:
+            cache_entry = WEATHER_CACHE[cache_key]
             # If cache is still valid (not expired)
-            if time.time() - cache_entry['timestamp'] < CACHE_EXPIRATION:
+            if _now() - cache_entry['timestamp'] < CACHE_EXPIRATION:
                 return cache_entry['data']
 
         # Scrape real weather data
         weather_data = scrape_weather(location)
 
-        # Cache the result
-        WEATHER_CACHE[location] = {
-            'data': weather_data,
-            'timestamp': time.time()
-        }
+        # Cache successful results only, so a failed lookup is retried next time
+        if weather_data.get("status") == "success":
+            WEATHER_CACHE[cache_key] = {
+                'data': weather_data,
+                'timestamp': _now()
+            }
 
         return weather_data
     except Exception as e:
@@ -111,7 +77,7 @@ def scrape_weather(location: str) -> Dict[str, Any]:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
 
-        response = requests.get(url, headers=headers)
+        response = _SESSION.get(url, headers=headers, timeout=_TIMEOUT)
         response.raise_for_status()  # Raise an exception for 4XX/5XX responses
 
         # Parse the JSON response
@@ -9,6 +9,8 @@ REM Parse arguments
 set TYPE=
 set COMPONENT=
 set HTML=
+set PARALLEL=
+set SLOW=
 
 :parse
 if "%~1"=="" goto :endparse
@@ -18,12 +20,14 @@ if "%~1"=="--frontend" set COMPONENT=--component frontend
 if "%~1"=="--backend" set COMPONENT=--component backend
 if "%~1"=="--tools" set COMPONENT=--component tools
 if "%~1"=="--html" set HTML=--html
+if "%~1"=="--parallel" set PARALLEL=--parallel
+if "%~1"=="--slow" set SLOW=--slow
 shift
 goto :parse
 :endparse
 
 REM Run the tests
-python tests/run_tests.py %TYPE% %COMPONENT% %HTML%
+python tests/run_tests.py %TYPE% %COMPONENT% %HTML% %PARALLEL% %SLOW%
 
 REM Check the exit code
 if %ERRORLEVEL% NEQ 0 (
@@ -10,6 +10,8 @@ conda activate mcp
 TYPE=""
 COMPONENT=""
 HTML=""
+PARALLEL=""
+SLOW=""
 
 for arg in "$@"; do
     case $arg in
@@ -31,11 +33,17 @@ for arg in "$@"; do
         --html)
             HTML="--html"
             ;;
+        --parallel)
+            PARALLEL="--parallel"
+            ;;
+        --slow)
+            SLOW="--slow"
+            ;;
     esac
 done
 
 # Run the tests
-python tests/run_tests.py $TYPE $COMPONENT $HTML
+python tests/run_tests.py $TYPE $COMPONENT $HTML $PARALLEL $SLOW
 
 # Check the exit code
 if [ $? -ne 0 ]; then
@@ -2,35 +2,64 @@
 """
 Pytest configuration and fixtures.
 """
-import os
 import sys
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from pathlib import Path
 import subprocess
 import time
 
-# Add the project root to the path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Import backend modules
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
-import app as flask_app
+# Make the project root (for ``backend.*`` imports) and the backend directory
+# (for its top-level ``app``/``tools``/``llm_client`` imports) importable once
+# for the whole session, so test modules don't have to patch sys.path themselves.
+# Appended rather than prepended so backend's generic top-level module names
+# (``config``, ``tools``, ``app``) never shadow installed packages
+ROOT_DIR = Path(__file__).resolve().parents[1]
+ROOT = str(ROOT_DIR)
+BACKEND = str(ROOT_DIR / 'backend')
+for path in (BACKEND, ROOT):
+    if path not in sys.path:
+        sys.path.append(path)
 
 
 @pytest.fixture
 def flask_test_client():
-    """Fixture for Flask test client."""
+    """Fixture for Flask test client.
+
+    The app is imported here rather than at module level so collecting a test
+    module doesn't load backend.tools (and numpy/sympy) unless it needs them.
+    """
+    import app as flask_app
     app = flask_app.app
     app.config['TESTING'] = True
     with app.test_client() as client:
         yield client
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
+def llm_client():
+    """Fixture exposing the backend ``llm_client`` module, imported once."""
+    import llm_client as module
+    return module
+
+
+@pytest.fixture(scope="session")
+def default_messages():
+    """Fixture for the standard system + user chat payload.
+
+    llm_call copies messages before sending them, so one list can be shared.
+    """
+    return [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": "Hello"}
+    ]
+
+
+@pytest.fixture(scope="session")
 def selenium_driver():
-    """Fixture for Selenium WebDriver."""
+    """Fixture for Selenium WebDriver, shared by every test in the session."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     # Set up the Chrome WebDriver with headless option
     chrome_options = Options()
     chrome_options.add_argument("--headless")
@@ -40,20 +69,33 @@ def selenium_driver():
     # Initialize the WebDriver
     try:
         driver = webdriver.Chrome(options=chrome_options)
-        driver.implicitly_wait(10)
-        yield driver
     except Exception as e:
         pytest.skip(f"Failed to initialize WebDriver: {e}")
-    finally:
-        if 'driver' in locals():
-            driver.quit()
+    driver.implicitly_wait(10)
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture(scope="session")
+def frontend_page(selenium_driver, frontend_url):
+    """Fixture that loads the frontend once and returns the driver showing it."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    selenium_driver.get(frontend_url)
+    # Wait for the page to load
+    WebDriverWait(selenium_driver, 10).until(
+        EC.presence_of_element_located((By.ID, "user-input"))
+    )
+    return selenium_driver
 
 
 @pytest.fixture(scope="module")
 def backend_server():
     """Fixture for running the backend server during tests."""
     # Start the backend server
-    backend_dir = Path(__file__).parent.parent / 'backend'
+    backend_dir = ROOT_DIR / 'backend'
     backend_path = backend_dir / 'app.py'
     
     # Use Python executable from current environment
@@ -83,8 +125,8 @@ def backend_server():
     process.wait()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def frontend_url():
     """Fixture for the frontend URL."""
-    frontend_path = Path(__file__).parent.parent / 'frontend' / 'index.html'
+    frontend_path = ROOT_DIR / 'frontend' / 'index.html'
     return f"file://{frontend_path.absolute()}"
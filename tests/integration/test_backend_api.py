@@ -3,7 +3,6 @@
 Integration tests for the backend API.
 Tests the API endpoints and tool functionality.
 """
-import os
 import sys
 import unittest
 import time
@@ -11,9 +10,8 @@ import json
 import requests
 import subprocess
 from pathlib import Path
-
-# Add the project root to the path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from types import SimpleNamespace
+from unittest.mock import patch
 
 
 class TestBackendAPI(unittest.TestCase):
@@ -133,10 +131,19 @@ class TestBackendAPI(unittest.TestCase):
 
     def test_direct_tool_call(self):
         """Test direct tool calls to verify tool functionality."""
-        from backend.tools import get_weather, pretty_print_weather_results
+        from backend.tools import get_weather, pretty_print_weather_results, weather
+
+        # Serve a canned wttr.in payload so the check doesn't depend on the network
+        payload = {
+            "nearest_area": [{"areaName": [{"value": "London"}], "country": [{"value": "United Kingdom"}]}],
+            "current_condition": [{"temp_C": "15", "weatherDesc": [{"value": "Cloudy"}]}]
+        }
+        response = SimpleNamespace(json=lambda: payload, raise_for_status=lambda: None)
 
         # Test the weather tool directly
-        weather_result = get_weather("London")
+        with patch.dict(weather.WEATHER_CACHE, clear=True), \
+                patch.object(weather._SESSION, "get", return_value=response):
+            weather_result = get_weather("London")
 
         # Check that the result has the expected structure
         self.assertEqual(weather_result["status"], "success")
@@ -1,15 +1,10 @@
 """Integration tests for Python Execution API endpoints."""
-import os
-import sys
 import unittest
 import json
 import time
 import pytest
 from unittest.mock import patch
 
-# Add the parent directory to the path so we can import the backend modules
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-
 # Import the Flask app
 from backend.app import app
 
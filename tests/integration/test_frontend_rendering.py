@@ -3,7 +3,6 @@
 Integration tests for the frontend rendering functionality.
 Tests the syntax highlighting and LaTeX rendering features.
 """
-import os
 import sys
 import unittest
 import time
@@ -15,9 +14,6 @@ from selenium.webdriver.support import expected_conditions as EC
 import subprocess
 from pathlib import Path
 
-# Add the project root to the path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-
 
 class TestFrontendRendering(unittest.TestCase):
     """Test cases for frontend rendering features."""
@@ -1,10 +1,7 @@
 """Integration tests for system information in the app."""
 import unittest
-import os
-import sys
 import json
 import platform
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from backend.app import get_system_prompt
 from backend.system_info import get_system_info
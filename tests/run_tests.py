@@ -12,7 +12,7 @@ import pytest
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
-def run_tests(test_type=None, component=None, html_report=False):
+def run_tests(test_type=None, component=None, html_report=False, parallel=False, slow=False):
     """
     Run the tests using pytest.
 
@@ -20,6 +20,8 @@ def run_tests(test_type=None, component=None, html_report=False):
         test_type (str, optional): Type of tests to run ('unit', 'integration', or None for all).
         component (str, optional): Component to test ('frontend', 'backend', 'tools', or None for all).
         html_report (bool, optional): Whether to generate an HTML report.
+        parallel (bool, optional): Whether to spread tests across CPU cores with pytest-xdist.
+        slow (bool, optional): Whether to include tests marked as slow.
 
     Returns:
         int: The pytest return code (0 for success, non-zero for failure).
@@ -34,14 +36,24 @@ def run_tests(test_type=None, component=None, html_report=False):
     if component:
         markers.append(component)
 
-    if markers:
-        pytest_args.append('-m ' + ' and '.join(markers))
+    # pytest only honours the last -m, so this expression replaces the
+    # "not slow" default from pytest.ini and has to carry it itself
+    if not slow:
+        markers.append('not slow')
+    elif not markers:
+        markers.append('slow or not slow')
+
+    pytest_args.extend(['-m', ' and '.join(markers)])
 
     # Add HTML report if requested
     if html_report:
         pytest_args.append('--html=test-report.html')
         pytest_args.append('--self-contained-html')
 
+    # Run test files in parallel worker processes if requested
+    if parallel:
+        pytest_args.extend(['-n', 'auto', '--dist=loadfile'])
+
     # Add coverage reporting
     pytest_args.append('--cov=backend')
     pytest_args.append('--cov=frontend')
@@ -62,7 +74,9 @@ if __name__ == '__main__':
     parser.add_argument('--type', choices=['unit', 'integration'], help='Type of tests to run')
     parser.add_argument('--component', choices=['frontend', 'backend', 'tools', 'computer_use'], help='Component to test')
     parser.add_argument('--html', action='store_true', help='Generate HTML report')
+    parser.add_argument('--parallel', action='store_true', help='Run tests in parallel with pytest-xdist')
+    parser.add_argument('--slow', action='store_true', help='Include slow tests')
     args = parser.parse_args()
 
-    exit_code = run_tests(args.type, args.component, args.html)
+    exit_code = run_tests(args.type, args.component, args.html, args.parallel, args.slow)
     sys.exit(exit_code)
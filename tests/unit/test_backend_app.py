@@ -2,17 +2,12 @@
 """
 Unit tests for the backend Flask application.
 """
-import sys
-import os
 import unittest
 from unittest.mock import patch, MagicMock
 import json
 import pytest
 import flask
 
-# Add the backend directory to the path so we can import the app module
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backend'))
-
 import app as flask_app
 
 
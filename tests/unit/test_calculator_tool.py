@@ -2,207 +2,180 @@
 """
 Unit tests for the calculator tool functionality.
 """
-import sys
-import os
-import unittest
 import pytest
 
-# Add the backend directory to the path so we can import the tools module
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backend'))
-
-from backend.tools import calculator, pretty_print_calculator_results
+# Expressions and their expected results, built once at import time
+ARITHMETIC_EXPRS: tuple[tuple[str, float], ...] = (
+    ("10 - 5", 5),
+    ("3 * 4", 12),
+    ("20 / 4", 5.0),
+    ("17 % 5", 2),
+    ("2 ** 3", 8),
+    ("(2 + 3) * 4 / 2 - 1", 9.0),
+)
+
+# Expressions the calculator must reject
+UNSAFE_EXPRS: tuple[str, ...] = (
+    "import os",
+    "open('file.txt')",
+    "__import__('os')",
+)
+
+# Read-only calculator results for the pretty print tests
+_NUMERIC_RESULT = {"status": "success", "result": 42, "result_type": "numeric"}
+_FLOAT_RESULT = {"status": "success", "result": 3.14159265359, "result_type": "numeric"}
+_SYMBOLIC_RESULT = {"status": "success", "result": "x**2 + 2*x + 1", "result_type": "symbolic"}
+_ARRAY_RESULT = {"status": "success", "result": [1, 2, 3, 4, 5], "result_type": "array"}
+_ERROR_RESULT = {"status": "error", "message": "Error evaluating expression: division by zero"}
+
+
+@pytest.fixture(scope="module")
+def calculator_tools():
+    """Import the calculator tool on first use rather than at collection time.
+
+    backend.tools pulls in numpy and sympy. Collecting this module on its own
+    therefore doesn't load them; the other tool test modules and the app
+    tests import backend.tools at module level, so a wider run still does.
+    The calculator module imports sympy unconditionally, so its tests are
+    skipped rather than erroring when sympy is not installed.
+    """
+    pytest.importorskip("sympy")
+    from backend.tools import calculator, pretty_print_calculator_results
+    return calculator, pretty_print_calculator_results
+
+
+@pytest.fixture(scope="module")
+def calc(calculator_tools):
+    """The calculator tool function."""
+    return calculator_tools[0]
 
 
 @pytest.mark.unit
 @pytest.mark.tools
-class TestCalculatorTool(unittest.TestCase):
+class TestCalculatorTool:
     """Test cases for the calculator tool."""
 
-    def test_basic_arithmetic(self):
+    def test_basic_arithmetic(self, calc):
         """Test basic arithmetic operations."""
         # Test addition
-        result = calculator("2 + 2")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], 4)
-        self.assertEqual(result["result_type"], "numeric")
-
-        # Test subtraction
-        result = calculator("10 - 5")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], 5)
-
-        # Test multiplication
-        result = calculator("3 * 4")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], 12)
-
-        # Test division
-        result = calculator("20 / 4")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], 5.0)
-
-        # Test modulo
-        result = calculator("17 % 5")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], 2)
-
-        # Test exponentiation
-        result = calculator("2 ** 3")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], 8)
-
-        # Test complex expression
-        result = calculator("(2 + 3) * 4 / 2 - 1")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], 9.0)
-
-    def test_mathematical_functions(self):
+        result = calc("2 + 2")
+        assert result["status"] == "success"
+        assert result["result"] == 4
+        assert result["result_type"] == "numeric"
+
+        # Test subtraction, multiplication, division, modulo, exponentiation
+        # and a complex expression
+        for expression, expected in ARITHMETIC_EXPRS:
+            result = calc(expression)
+            assert result["status"] == "success"
+            assert result["result"] == expected
+
+    def test_mathematical_functions(self, calc):
         """Test mathematical functions from the math library."""
         # Test sin
-        result = calculator("math.sin(math.pi/2)")
-        self.assertEqual(result["status"], "success")
-        self.assertAlmostEqual(result["result"], 1.0, places=10)
+        result = calc("math.sin(math.pi/2)")
+        assert result["status"] == "success"
+        assert result["result"] == pytest.approx(1.0, abs=1e-10)
 
         # Test cos
-        result = calculator("math.cos(0)")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], 1.0)
+        result = calc("math.cos(0)")
+        assert result["status"] == "success"
+        assert result["result"] == 1.0
 
         # Test sqrt
-        result = calculator("math.sqrt(16)")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], 4.0)
+        result = calc("math.sqrt(16)")
+        assert result["status"] == "success"
+        assert result["result"] == 4.0
 
         # Test log
-        result = calculator("math.log(math.e)")
-        self.assertEqual(result["status"], "success")
-        self.assertAlmostEqual(result["result"], 1.0, places=10)
+        result = calc("math.log(math.e)")
+        assert result["status"] == "success"
+        assert result["result"] == pytest.approx(1.0, abs=1e-10)
 
         # Test constants
-        result = calculator("math.pi")
-        self.assertEqual(result["status"], "success")
-        self.assertAlmostEqual(result["result"], 3.14159265359, places=10)
+        result = calc("math.pi")
+        assert result["status"] == "success"
+        assert result["result"] == pytest.approx(3.14159265359, abs=1e-10)
 
-    def test_numpy_operations(self):
+    def test_numpy_operations(self, calc):
         """Test numpy operations."""
         # Test array creation
-        result = calculator("np.array([1, 2, 3, 4, 5])")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result_type"], "array")
-        self.assertEqual(result["result"], [1, 2, 3, 4, 5])
+        result = calc("np.array([1, 2, 3, 4, 5])")
+        assert result["status"] == "success"
+        assert result["result_type"] == "array"
+        assert result["result"] == [1, 2, 3, 4, 5]
 
         # Test array operations
-        result = calculator("np.array([1, 2, 3]) + np.array([4, 5, 6])")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], [5, 7, 9])
+        result = calc("np.array([1, 2, 3]) + np.array([4, 5, 6])")
+        assert result["status"] == "success"
+        assert result["result"] == [5, 7, 9]
 
         # Test numpy functions
-        result = calculator("np.mean([1, 2, 3, 4, 5])")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], 3.0)
+        result = calc("np.mean([1, 2, 3, 4, 5])")
+        assert result["status"] == "success"
+        assert result["result"] == 3.0
 
         # Test matrix operations
-        result = calculator("np.dot(np.array([1, 2]), np.array([3, 4]))")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result"], 11)
+        result = calc("np.dot(np.array([1, 2]), np.array([3, 4]))")
+        assert result["status"] == "success"
+        assert result["result"] == 11
 
-    def test_sympy_operations(self):
+    def test_sympy_operations(self, calc):
         """Test sympy operations."""
         # Test symbolic variables
-        result = calculator("sympy.Symbol('x')")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result_type"], "symbolic")
-        self.assertEqual(result["result"], "x")
+        result = calc("sympy.Symbol('x')")
+        assert result["status"] == "success"
+        assert result["result_type"] == "symbolic"
+        assert result["result"] == "x"
 
         # Test symbolic expressions
-        result = calculator("x = sympy.Symbol('x'); x**2 + 2*x + 1")
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["result_type"], "symbolic")
-        self.assertEqual(result["result"], "x**2 + 2*x + 1")
+        result = calc("x = sympy.Symbol('x'); x**2 + 2*x + 1")
+        assert result["status"] == "success"
+        assert result["result_type"] == "symbolic"
+        assert result["result"] == "x**2 + 2*x + 1"
 
         # Test solving equations with sympy.solve
-        result = calculator("x = sympy.Symbol('x'); sympy.solve(x**2 - 4, x)")
-        self.assertEqual(result["status"], "success")
+        result = calc("x = sympy.Symbol('x'); sympy.solve(x**2 - 4, x)")
+        assert result["status"] == "success"
         # The result should be a list of solutions: [-2, 2]
-        self.assertTrue("[-2, 2]" in result["result"] or "[2, -2]" in result["result"])
+        assert "[-2, 2]" in result["result"] or "[2, -2]" in result["result"]
 
         # Test using solve directly
-        result = calculator("x = Symbol('x'); solve(x**2 - 4, x)")
-        self.assertEqual(result["status"], "success")
+        result = calc("x = Symbol('x'); solve(x**2 - 4, x)")
+        assert result["status"] == "success"
         # The result should be a list of solutions: [-2, 2]
-        self.assertTrue("[-2, 2]" in result["result"] or "[2, -2]" in result["result"])
+        assert "[-2, 2]" in result["result"] or "[2, -2]" in result["result"]
 
-    def test_error_handling(self):
+    def test_error_handling(self, calc):
         """Test error handling for invalid expressions."""
         # Test division by zero
-        result = calculator("1/0")
-        self.assertEqual(result["status"], "error")
-        self.assertIn("division by zero", result["message"].lower())
+        result = calc("1/0")
+        assert result["status"] == "error"
+        assert "division by zero" in result["message"].lower()
 
         # Test invalid syntax
-        result = calculator("2 +* 3")
-        self.assertEqual(result["status"], "error")
-        self.assertIn("error", result["message"].lower())
+        result = calc("2 +* 3")
+        assert result["status"] == "error"
+        assert "error" in result["message"].lower()
 
         # Test disallowed operations
-        result = calculator("import os")
-        self.assertEqual(result["status"], "error")
-        self.assertIn("disallowed", result["message"].lower())
-
-        result = calculator("open('file.txt')")
-        self.assertEqual(result["status"], "error")
-        self.assertIn("disallowed", result["message"].lower())
-
-        result = calculator("__import__('os')")
-        self.assertEqual(result["status"], "error")
-        self.assertIn("disallowed", result["message"].lower())
-
-    def test_pretty_print_calculator_results(self):
-        """Test the pretty print function for calculator results."""
-        # Test numeric result
-        result = {
-            "status": "success",
-            "result": 42,
-            "result_type": "numeric"
-        }
-        formatted = pretty_print_calculator_results(result)
-        self.assertEqual(formatted, "Result: 42")
-
-        # Test float result
-        result = {
-            "status": "success",
-            "result": 3.14159265359,
-            "result_type": "numeric"
-        }
-        formatted = pretty_print_calculator_results(result)
-        self.assertEqual(formatted, "Result: 3.141592654")
-
-        # Test symbolic result
-        result = {
-            "status": "success",
-            "result": "x**2 + 2*x + 1",
-            "result_type": "symbolic"
-        }
-        formatted = pretty_print_calculator_results(result)
-        self.assertEqual(formatted, "Result: x**2 + 2*x + 1")
-
-        # Test array result
-        result = {
-            "status": "success",
-            "result": [1, 2, 3, 4, 5],
-            "result_type": "array"
-        }
-        formatted = pretty_print_calculator_results(result)
-        self.assertEqual(formatted, "Result (array):\n[1, 2, 3, 4, 5]")
-
-        # Test error result
-        result = {
-            "status": "error",
-            "message": "Error evaluating expression: division by zero"
-        }
-        formatted = pretty_print_calculator_results(result)
-        self.assertEqual(formatted, "Error evaluating expression: division by zero")
-
-
-if __name__ == '__main__':
-    unittest.main()
+        for expression in UNSAFE_EXPRS:
+            result = calc(expression)
+            assert result["status"] == "error"
+            assert "disallowed" in result["message"].lower()
+
+
+@pytest.mark.unit
+@pytest.mark.tools
+@pytest.mark.parametrize("result, expected", [
+    (_NUMERIC_RESULT, "Result: 42"),
+    (_FLOAT_RESULT, "Result: 3.141592654"),
+    (_SYMBOLIC_RESULT, "Result: x**2 + 2*x + 1"),
+    (_ARRAY_RESULT, "Result (array):\n[1, 2, 3, 4, 5]"),
+    (_ERROR_RESULT, "Error evaluating expression: division by zero"),
+], ids=["numeric", "float", "symbolic", "array", "error"])
+def test_pretty_print_calculator_results(calculator_tools, result, expected):
+    """Test the pretty print function for calculator results."""
+    _, pretty_print_calculator_results = calculator_tools
+    assert pretty_print_calculator_results(result) == expected
+
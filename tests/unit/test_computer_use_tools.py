@@ -1,66 +1,76 @@
 """Unit tests for Python execution tool."""
-import os
-import sys
-import unittest
 import pytest
-import io
-import matplotlib.pyplot as plt
-from unittest.mock import patch, MagicMock
-
-# Add the parent directory to the path so we can import the backend modules
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from unittest.mock import patch
 
 from backend.computer_use.tools import (
     execute_python,
     pretty_print_execute_python_results
 )
+from backend.computer_use.tools.python_execution import _compile_user
 from backend.computer_use.tools.utils import sanitize_python_code
 
+pytestmark = [pytest.mark.unit, pytest.mark.computer_use]
 
-@pytest.mark.unit
-@pytest.mark.computer_use
-class TestPythonExecutionTool(unittest.TestCase):
-    """Test cases for Python execution tool."""
-
-    def test_execute_python_success(self):
-        """Test executing Python code successfully."""
-        code = """
+# Code snippets shared by the execute_python tests
+CODE_SUCCESS = """
 result = 2 + 2
 """
-        result = execute_python(code)
-        self.assertEqual(result["status"], "success")
-        self.assertTrue("4" in result["output"] or result["variables"]["result"] == "4")
 
-    def test_execute_python_error(self):
-        """Test executing Python code with an error."""
-        code = """
+CODE_ERROR = """
 result = 1 / 0
 """
-        result = execute_python(code)
-        self.assertEqual(result["status"], "error")
-        self.assertIn("division by zero", result["message"])
 
-    def test_execute_python_with_imports(self):
-        """Test executing Python code with various imports."""
-        code = """
+CODE_IMPORTS = """
 import shutil
 import os
 result = "Successfully imported modules"
 """
-        result = execute_python(code)
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["variables"]["result"], "Successfully imported modules")
 
-    def test_execute_python_with_print(self):
-        """Test executing Python code with print statements."""
-        code = """
+CODE_PRINT = """
 print("Hello, world!")
 result = 42
 """
+
+CODE_MARKDOWN = """```python
+result = 2 + 2
+```"""
+
+# Expected pretty_print_execute_python_results output
+PRETTY_SUCCESS = "Hello, world!\n\nVariables:\n- x: 2\n- y: 2\n"
+
+PRETTY_WITH_ERROR = (
+    "Some output\n\n"
+    "Errors/Warnings:\nWarning: something went wrong\n\n"
+    "Variables:\n- x: 2\n"
+)
+
+
+class TestPythonExecutionTool:
+    """Test cases for Python execution tool."""
+
+    @pytest.mark.parametrize("code, expected_status, field, expected_substr, expected_vars", [
+        (CODE_SUCCESS, "success", "output", "4", {"result": "4"}),
+        (CODE_ERROR, "error", "message", "division by zero", {}),
+        (CODE_IMPORTS, "success", "output", "Successfully imported modules",
+         {"result": "Successfully imported modules"}),
+        (CODE_PRINT, "success", "output", "Hello, world!", {"result": "42"}),
+        (CODE_MARKDOWN, "success", "output", "4", {"result": "4"}),
+    ], ids=["success", "error", "imports", "print", "markdown"])
+    def test_execute_python(self, code, expected_status, field, expected_substr, expected_vars):
+        """Test executing Python code and checking its status, output and captured variables."""
         result = execute_python(code)
-        self.assertEqual(result["status"], "success")
-        self.assertIn("Hello, world!", result["output"])
-        self.assertEqual(result["variables"]["result"], "42")
+        assert result["status"] == expected_status
+        assert expected_substr in result[field]
+        for name, value in expected_vars.items():
+            assert result["variables"][name] == value
+
+    def test_execute_python_reuses_compiled_code(self):
+        """Test that running the same snippet twice compiles it only once."""
+        execute_python(CODE_IMPORTS)
+        hits = _compile_user.cache_info().hits
+        result = execute_python(CODE_IMPORTS)
+        assert result["status"] == "success"
+        assert _compile_user.cache_info().hits == hits + 1
 
     @patch('matplotlib.pyplot.savefig')
     def test_execute_python_with_matplotlib(self, mock_savefig):
@@ -77,8 +87,8 @@ result = "Plot created"
         mock_savefig.return_value = None
 
         result = execute_python(code)
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["variables"]["result"], "Plot created")
+        assert result["status"] == "success"
+        assert result["variables"]["result"] == "Plot created"
         # Verify savefig was called (figure was captured)
         mock_savefig.assert_called_once()
 
@@ -90,11 +100,7 @@ result = "Plot created"
             "variables": {"result": "42", "x": "2", "y": "2"},
             "error_output": None
         }
-        output = pretty_print_execute_python_results(result)
-        self.assertIn("Hello, world!", output)
-        self.assertIn("Variables:", output)
-        self.assertIn("- x: 2", output)
-        self.assertIn("- y: 2", output)
+        assert pretty_print_execute_python_results(result) == PRETTY_SUCCESS
 
     def test_pretty_print_execute_python_with_error(self):
         """Test pretty printing execute_python results with errors."""
@@ -104,10 +110,7 @@ result = "Plot created"
             "variables": {"x": "2"},
             "error_output": "Warning: something went wrong"
         }
-        output = pretty_print_execute_python_results(result)
-        self.assertIn("Some output", output)
-        self.assertIn("Errors/Warnings:", output)
-        self.assertIn("Warning: something went wrong", output)
+        assert pretty_print_execute_python_results(result) == PRETTY_WITH_ERROR
 
     def test_pretty_print_execute_python_with_figure(self):
         """Test pretty printing execute_python results with figure."""
@@ -118,8 +121,8 @@ result = "Plot created"
             "figure": "base64encodeddata"
         }
         output = pretty_print_execute_python_results(result)
-        self.assertIn("Plot created", output)
-        self.assertIn("<img src=\"data:image/png;base64,base64encodeddata\" />", output)
+        assert "Plot created" in output
+        assert "<img src=\"data:image/png;base64,base64encodeddata\" />" in output
 
     def test_sanitize_python_code_markdown_block(self):
         """Test sanitizing Python code with markdown code block formatting."""
@@ -142,10 +145,10 @@ plt.savefig(image_path, dpi=300)
 plt.close()
 ```"""
         sanitized = sanitize_python_code(code)
-        self.assertNotIn("```python", sanitized)
-        self.assertNotIn("```", sanitized)
-        self.assertIn("import numpy as np", sanitized)
-        self.assertIn("plt.savefig(image_path, dpi=300)", sanitized)
+        assert "```python" not in sanitized
+        assert "```" not in sanitized
+        assert "import numpy as np" in sanitized
+        assert "plt.savefig(image_path, dpi=300)" in sanitized
 
     def test_sanitize_python_code_with_extra_text(self):
         """Test sanitizing Python code with extra text like 'python', 'Copy', 'Edit'."""
@@ -157,23 +160,10 @@ print('Hello, world!')
 result = 42
 ```"""
         sanitized = sanitize_python_code(code)
-        self.assertNotIn("python", sanitized)
-        self.assertNotIn("Copy", sanitized)
-        self.assertNotIn("Edit", sanitized)
-        self.assertNotIn("```py", sanitized)
-        self.assertNotIn("```", sanitized)
-        self.assertIn("print('Hello, world!')", sanitized)
-        self.assertIn("result = 42", sanitized)
-
-    def test_execute_python_with_markdown_formatting(self):
-        """Test executing Python code with markdown formatting."""
-        code = """```python
-result = 2 + 2
-```"""
-        result = execute_python(code)
-        self.assertEqual(result["status"], "success")
-        self.assertTrue("4" in result["output"] or result["variables"]["result"] == "4")
-
-
-if __name__ == '__main__':
-    unittest.main()
+        assert "python" not in sanitized
+        assert "Copy" not in sanitized
+        assert "Edit" not in sanitized
+        assert "```py" not in sanitized
+        assert "```" not in sanitized
+        assert "print('Hello, world!')" in sanitized
+        assert "result = 42" in sanitized
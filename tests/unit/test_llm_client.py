@@ -2,82 +2,138 @@
 """
 Unit tests for the LLM client functionality.
 """
-import sys
-import os
-import unittest
-from unittest.mock import patch, MagicMock
+from collections import namedtuple
+from collections.abc import Iterator
 import json
 import pytest
 
-# Add the backend directory to the path so we can import the llm_client module
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backend'))
+from config import DEFAULT_TEMPERATURE, DEFAULT_MAX_MODEL_TOKENS
 
-import llm_client
+# Every test here runs against its own stub client, so the module is xdist-safe
+pytestmark = pytest.mark.parallel_safe
+
+# Cheap stand-in for the ollama chat response; only ``.message`` is read
+ChatResponse = namedtuple("ChatResponse", "message")
+
+
+def mk_response(content, tool_calls=None):
+    """Build a chat response carrying a fresh assistant message dict."""
+    return ChatResponse({
+        "role": "assistant",
+        "content": content,
+        "tool_calls": tool_calls if tool_calls is not None else []
+    })
+
+
+# Content of the canned successful response. llm_call hands back the response
+# message dict itself, so each test builds its own response with mk_response.
+_GREETING_TEXT = "Hello, how can I help you today?"
+# Search tool call returned by the tool-call test
+_TOOL_ARGS_JSON = json.dumps({"query": "Python programming language", "max_results": 3})
+_TOOL_CALL = {
+    "id": "call_123",
+    "type": "function",
+    "function": {"name": "search", "arguments": _TOOL_ARGS_JSON}
+}
+# Expected llm_call results
+_GREETING = {"role": "assistant", "content": _GREETING_TEXT, "tool_calls": []}
+_FALLBACK = {
+    "role": "assistant",
+    "content": "I'm sorry, I encountered an error processing your request. Please try again."
+}
+
+
+class StubOllamaClient:
+    """Minimal ``ollama.Client`` stand-in that records every ``chat`` call.
+
+    ``responses`` is returned from ``chat``; exceptions are raised instead, and
+    an iterator is advanced once per call.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.responses = None
+
+    def chat(self, **kwargs):
+        self.calls.append(kwargs)
+        out = next(self.responses) if isinstance(self.responses, Iterator) else self.responses
+        if isinstance(out, Exception):
+            raise out
+        return out
+
+
+def assert_chat_called_with(stub, **expected):
+    """Assert ``chat`` was called exactly once with ``expected`` and return its kwargs."""
+    assert len(stub.calls) == 1
+    kwargs = stub.calls[-1]
+    for key, value in expected.items():
+        assert kwargs.get(key) == value, (key, kwargs.get(key), value)
+    return kwargs
+
+
+@pytest.fixture
+def mock_ollama(monkeypatch, llm_client):
+    """Install a fresh stub ollama client for a single test."""
+    stub = StubOllamaClient()
+    monkeypatch.setattr(llm_client.ollama, "Client", lambda *a, **k: stub)
+    # llm_client caches its client, so drop it on both sides of the test
+    llm_client._get_client.cache_clear()
+    yield stub
+    llm_client._get_client.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch, llm_client):
+    """Skip the real back-off between retries."""
+    monkeypatch.setattr(llm_client.time, "sleep", lambda *_a, **_k: None)
 
 
 @pytest.mark.unit
 @pytest.mark.backend
-class TestLLMClient(unittest.TestCase):
+class TestLLMClient:
     """Test cases for the LLM client."""
 
-    @patch('llm_client.ollama.Client')
-    def test_llm_call_success(self, mock_client_class):
+    def test_llm_call_success(self, llm_client, mock_ollama, default_messages):
         """Test that the LLM call function works correctly."""
         # Set up the mock
-        mock_client_instance = mock_client_class.return_value
-        mock_response = MagicMock()
-        mock_response.message = {
-            "role": "assistant",
-            "content": "Hello, how can I help you today?",
-            "tool_calls": []
-        }
-        mock_client_instance.chat.return_value = mock_response
+        mock_ollama.responses = mk_response(_GREETING_TEXT)
         
         # Call the function
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": "Hello"}
-        ]
-        
-        result = llm_client.llm_call(messages)
+        result = llm_client.llm_call(default_messages)
         
         # Verify the result
-        self.assertEqual(result["role"], "assistant")
-        self.assertEqual(result["content"], "Hello, how can I help you today?")
+        assert result == _GREETING
         
         # Verify the mock was called correctly
-        mock_client_instance.chat.assert_called_once()
-        args, kwargs = mock_client_instance.chat.call_args
-        self.assertEqual(kwargs["model"], llm_client.OLLAMA_MODEL)
-        self.assertEqual(kwargs["messages"], messages)
-        self.assertEqual(kwargs["stream"], False)
-        self.assertEqual(kwargs["options"]["temperature"], llm_client.DEFAULT_TEMPERATURE)
-        self.assertEqual(kwargs["options"]["num_predict"], llm_client.DEFAULT_MAX_MODEL_TOKENS)
-
-    @patch('llm_client.ollama.Client')
-    def test_llm_call_with_tool_calls(self, mock_client_class):
+        kwargs = assert_chat_called_with(
+            mock_ollama,
+            model=llm_client.OLLAMA_MODEL,
+            messages=default_messages,
+            stream=False
+        )
+        assert kwargs["options"]["temperature"] == llm_client.DEFAULT_TEMPERATURE
+        assert kwargs["options"]["num_predict"] == llm_client.DEFAULT_MAX_MODEL_TOKENS
+
+    def test_llm_call_reuses_client(self, llm_client, mock_ollama, default_messages, monkeypatch):
+        """Test that consecutive calls share one pooled ollama client."""
+        created = []
+        monkeypatch.setattr(llm_client.ollama, "Client",
+                            lambda *a, **k: created.append(k) or mock_ollama)
+        mock_ollama.responses = mk_response(_GREETING_TEXT)
+
+        llm_client.llm_call(default_messages)
+        llm_client.llm_call(default_messages)
+
+        assert len(created) == 1
+        assert len(mock_ollama.calls) == 2
+
+    def test_llm_call_with_tool_calls(self, llm_client, mock_ollama):
         """Test that the LLM call function handles tool calls correctly."""
         # Set up the mock
-        mock_client_instance = mock_client_class.return_value
-        mock_response = MagicMock()
-        mock_response.message = {
-            "role": "assistant",
-            "content": "I'll search for information about Python.",
-            "tool_calls": [
-                {
-                    "id": "call_123",
-                    "type": "function",
-                    "function": {
-                        "name": "search",
-                        "arguments": json.dumps({
-                            "query": "Python programming language",
-                            "max_results": 3
-                        })
-                    }
-                }
-            ]
-        }
-        mock_client_instance.chat.return_value = mock_response
+        mock_ollama.responses = mk_response(
+            "I'll search for information about Python.",
+            tool_calls=[_TOOL_CALL]
+        )
         
         # Call the function
         messages = [
@@ -88,134 +144,77 @@ class TestLLMClient(unittest.TestCase):
         result = llm_client.llm_call(messages)
         
         # Verify the result
-        self.assertEqual(result["role"], "assistant")
-        self.assertEqual(result["content"], "I'll search for information about Python.")
+        assert {k: result[k] for k in ("role", "content")} == {
+            "role": "assistant",
+            "content": "I'll search for information about Python."
+        }
         
-        self.assertIn("tool_calls", result)
-        self.assertEqual(len(result["tool_calls"]), 1)
-        self.assertEqual(result["tool_calls"][0]["function"]["name"], "search")
-        self.assertIn("Python programming language", result["tool_calls"][0]["function"]["arguments"])
+        assert "tool_calls" in result
+        assert len(result["tool_calls"]) == 1
+        assert result["tool_calls"][0]["function"]["name"] == "search"
+        assert "Python programming language" in result["tool_calls"][0]["function"]["arguments"]
 
-    @patch('llm_client.ollama.Client')
-    def test_llm_call_retry_on_error(self, mock_client_class):
+    def test_llm_call_retry_on_error(self, llm_client, mock_ollama, default_messages):
         """Test that the LLM call function retries on error."""
         # Set up the mock to fail on first call and succeed on second
-        mock_client_instance = mock_client_class.return_value
         
         # First call raises an exception
-        mock_client_instance.chat.side_effect = [
-            Exception("API error"),
-            MagicMock(message={
-                "role": "assistant",
-                "content": "Hello, how can I help you today?",
-                "tool_calls": []
-            })
-        ]
+        mock_ollama.responses = iter((Exception("API error"), mk_response(_GREETING_TEXT)))
         
         # Call the function
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": "Hello"}
-        ]
-        
-        result = llm_client.llm_call(messages)
+        result = llm_client.llm_call(default_messages)
         
         # Verify the result
-        self.assertEqual(result["role"], "assistant")
-        self.assertEqual(result["content"], "Hello, how can I help you today?")
+        assert result == _GREETING
         
         # Verify the mock was called twice
-        self.assertEqual(mock_client_instance.chat.call_count, 2)
+        assert len(mock_ollama.calls) == 2
+
+    @pytest.mark.parametrize("bad, good", [
+        ("<|im_start|>This has problematic tokens", "Hello, this is a clean response."),
+        ("stuff<|im_end|>", "ok, done"),
+    ], ids=["im_start", "im_end"])
+    def test_llm_call_retries_problematic_tokens(self, llm_client, mock_ollama, default_messages, bad, good):
+        """Test that a response containing special tokens is retried."""
+        mock_ollama.responses = iter((mk_response(bad), mk_response(good)))
+
+        result = llm_client.llm_call(default_messages, max_retries=1)
+
+        assert result["content"] == good
+        assert len(mock_ollama.calls) == 2
 
-    @patch('llm_client.ollama.Client')
-    def test_llm_call_max_retries_exceeded(self, mock_client_class):
+    def test_llm_call_max_retries_exceeded(self, llm_client, mock_ollama, default_messages):
         """Test that the LLM call function handles max retries exceeded."""
         # Set up the mock to always fail
-        mock_client_instance = mock_client_class.return_value
-        mock_client_instance.chat.side_effect = Exception("API error")
-        
-        # Call the function with a small max_retries value
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": "Hello"}
-        ]
+        mock_ollama.responses = Exception("API error")
         
         # Call with max_retries=0 to fail immediately
-        result = llm_client.llm_call(messages, max_retries=0)
+        result = llm_client.llm_call(default_messages, max_retries=0)
         
         # Verify the result contains the error message
-        self.assertEqual(result["role"], "assistant")
-        self.assertEqual(result["content"], "I'm sorry, I encountered an error processing your request. Please try again.")
+        assert result == _FALLBACK
         
         # Verify the mock was called the expected number of times
-        self.assertEqual(mock_client_instance.chat.call_count, 1)  # Initial call only, no retries
-
-
-# New tests for temperature and max_tokens
-@patch('llm_client.ollama.Client')
-def test_llm_call_uses_custom_temp_and_tokens(mock_client_class):
-    """Test llm_call uses provided temperature and max_tokens."""
-    mock_client_instance = mock_client_class.return_value
-    mock_response = MagicMock()
-    mock_response.message = {"role": "assistant", "content": "Test response"}
-    mock_client_instance.chat.return_value = mock_response
-
-    custom_temp = 0.99
-    custom_tokens = 555
-    messages = [{"role": "user", "content": "Hello"}]
-
-    # Directly import llm_call
-    from llm_client import llm_call
-    
-    llm_call(messages, temperature=custom_temp, max_tokens=custom_tokens)
-
-    assert mock_client_instance.chat.call_count == 1
-    called_args, called_kwargs = mock_client_instance.chat.call_args
-    options = called_kwargs['options']
-
-    assert options['temperature'] == custom_temp
-    assert options['num_predict'] == custom_tokens
-
-@patch('llm_client.ollama.Client')
-def test_llm_call_uses_default_temp_and_tokens_if_none(mock_client_class):
-    """Test llm_call uses default temp/tokens if None are provided."""
-    mock_client_instance = mock_client_class.return_value
-    mock_response = MagicMock()
-    mock_response.message = {"role": "assistant", "content": "Test response"}
-    mock_client_instance.chat.return_value = mock_response
+        assert len(mock_ollama.calls) == 1  # Initial call only, no retries
+
+
+# Temperature and max_tokens handling
+@pytest.mark.parametrize("kwargs, expected_temp, expected_tokens", [
+    ({"temperature": 0.7, "max_tokens": 555}, 0.7, 555),
+    # llm_call clamps the temperature to [0.1, 0.9]
+    ({"temperature": 0.99, "max_tokens": 555}, 0.9, 555),
+    ({"temperature": None, "max_tokens": None}, DEFAULT_TEMPERATURE, DEFAULT_MAX_MODEL_TOKENS),
+    ({}, DEFAULT_TEMPERATURE, DEFAULT_MAX_MODEL_TOKENS),
+], ids=["custom", "clamped", "explicit_none", "implicit_default"])
+def test_llm_call_temp_and_tokens(llm_client, mock_ollama, kwargs, expected_temp, expected_tokens):
+    """Test llm_call uses the given (clamped) temperature/max_tokens, or the defaults."""
+    mock_ollama.responses = mk_response("Test response")
     messages = [{"role": "user", "content": "Hello"}]
 
-    # Directly import llm_call and config values for these new tests
-    from llm_client import llm_call
-    from config import DEFAULT_TEMPERATURE, DEFAULT_MAX_MODEL_TOKENS
+    llm_client.llm_call(messages, **kwargs)
 
-    llm_call(messages, temperature=None, max_tokens=None) # Explicitly pass None
-
-    assert mock_client_instance.chat.call_count == 1
-    called_args, called_kwargs = mock_client_instance.chat.call_args
-    options = called_kwargs['options']
+    options = assert_chat_called_with(mock_ollama)['options']
     # The retry logic adds a small amount (0.05 * retries) if retries > 0.
     # For the first attempt (retries=0), temp_adjustment is 0.
-    assert options['temperature'] == DEFAULT_TEMPERATURE
-    assert options['num_predict'] == DEFAULT_MAX_MODEL_TOKENS
-
-@patch('llm_client.ollama.Client')
-def test_llm_call_uses_default_temp_and_tokens_implicitly(mock_client_class):
-    """Test llm_call uses default temp/tokens if arguments are not passed."""
-    mock_client_instance = mock_client_class.return_value
-    mock_response = MagicMock()
-    mock_response.message = {"role": "assistant", "content": "Test response"}
-    mock_client_instance.chat.return_value = mock_response
-    messages = [{"role": "user", "content": "Hello"}]
-
-    # Directly import llm_call and config values for these new tests
-    from llm_client import llm_call
-    from config import DEFAULT_TEMPERATURE, DEFAULT_MAX_MODEL_TOKENS
-    
-    llm_call(messages) # Not passing temp/tokens
-
-    assert mock_client_instance.chat.call_count == 1
-    called_args, called_kwargs = mock_client_instance.chat.call_args
-    options = called_kwargs['options']
-    assert options['temperature'] == DEFAULT_TEMPERATURE
-    assert options['num_predict'] == DEFAULT_MAX_MODEL_TOKENS
+    assert options['temperature'] == expected_temp
+    assert options['num_predict'] == expected_tokens
@@ -1,10 +1,15 @@
-import json
+import orjson
 import pytest
 from backend.app import app, LLM_SETTINGS # Assuming app can be imported like this
 from backend.config import DEFAULT_TEMPERATURE, DEFAULT_MAX_MODEL_TOKENS
 
-@pytest.fixture
+# Each test uses its own session_id, and every xdist worker imports its own app,
+# so the tests hold up however they are distributed
+pytestmark = pytest.mark.parallel_safe
+
+@pytest.fixture(scope="module")
 def client():
+    """Shared test client; each test isolates its state with a unique session_id."""
     app.config['TESTING'] = True
     with app.test_client() as client:
         yield client
@@ -13,7 +18,7 @@ def test_get_llm_settings_default(client):
     """Test GET /api/llm-settings returns default settings for a new session."""
     response = client.get('/api/llm-settings?session_id=test_session_get_default')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['status'] == 'success'
     assert data['settings']['temperature'] == DEFAULT_TEMPERATURE
     assert data['settings']['max_tokens'] == DEFAULT_MAX_MODEL_TOKENS
@@ -27,7 +32,7 @@ def test_post_llm_settings(client):
     response = client.post(f'/api/llm-settings?session_id={session_id}',
                            json={"settings": new_settings})
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['status'] == 'success'
     assert data['settings']['temperature'] == new_settings['temperature']
     assert data['settings']['max_tokens'] == new_settings['max_tokens']
@@ -35,7 +40,7 @@ def test_post_llm_settings(client):
     # Then, GET to verify they were stored
     response_get = client.get(f'/api/llm-settings?session_id={session_id}')
     assert response_get.status_code == 200
-    data_get = json.loads(response_get.data)
+    data_get = orjson.loads(response_get.data)
     assert data_get['settings']['temperature'] == new_settings['temperature']
     assert data_get['settings']['max_tokens'] == new_settings['max_tokens']
 
@@ -50,7 +55,7 @@ def test_post_llm_settings_partial_update(client):
     response = client.post(f'/api/llm-settings?session_id={session_id}',
                            json={"settings": new_temp_settings})
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['settings']['temperature'] == new_temp_settings['temperature']
     assert data['settings']['max_tokens'] == DEFAULT_MAX_MODEL_TOKENS # Should remain default
 
@@ -59,7 +64,7 @@ def test_post_llm_settings_partial_update(client):
     response = client.post(f'/api/llm-settings?session_id={session_id}',
                            json={"settings": new_tokens_settings})
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['settings']['temperature'] == new_temp_settings['temperature'] # Should be from previous update
     assert data['settings']['max_tokens'] == new_tokens_settings['max_tokens']
 
@@ -74,7 +79,7 @@ def test_post_llm_settings_invalid_data(client):
     # This test might need adjustment based on desired error handling stringency.
     # For now, let's check it doesn't crash and returns success with defaults or valid partial updates.
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['status'] == 'success'
     # Depending on implementation, it might return defaults or partially updated valid values.
     # Current app.py initializes with defaults, then updates valid fields.
@@ -90,7 +95,7 @@ def test_reset_clears_llm_settings(client):
     # Set some custom settings
     client.post(f'/api/llm-settings?session_id={session_id}', json={"settings": custom_settings})
     response = client.get(f'/api/llm-settings?session_id={session_id}')
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['settings']['temperature'] == custom_settings['temperature']
 
     # Reset the session
@@ -98,8 +103,36 @@ def test_reset_clears_llm_settings(client):
 
     # Verify settings are reset to default
     response_after_reset = client.get(f'/api/llm-settings?session_id={session_id}')
-    data_after_reset = json.loads(response_after_reset.data)
+    data_after_reset = orjson.loads(response_after_reset.data)
     assert data_after_reset['settings']['temperature'] == DEFAULT_TEMPERATURE
     assert data_after_reset['settings']['max_tokens'] == DEFAULT_MAX_MODEL_TOKENS
     # Also ensure the LLM_SETTINGS dictionary on the server side reflects this for the session
     assert LLM_SETTINGS.get(session_id) is None # Or it's explicitly set to defaults, app.py deletes the key
+
+
+def test_llm_settings_evicts_old_sessions(client, monkeypatch):
+    """Test that the settings cache drops the oldest session once it is full."""
+    import backend.app as app_module
+    small_cache = type(LLM_SETTINGS)(maxsize=2, ttl=LLM_SETTINGS.ttl)
+    monkeypatch.setattr(app_module, "LLM_SETTINGS", small_cache)
+
+    for i in range(3):
+        client.get(f'/api/llm-settings?session_id=test_session_evict_{i}')
+
+    assert len(small_cache) == 2
+    assert 'test_session_evict_0' not in small_cache
+    assert 'test_session_evict_2' in small_cache
+
+@pytest.mark.parametrize("obj, kwargs, expected", [
+    ({"b": 1, "a": 2}, {"sort_keys": True}, '{"a":2,"b":1}'),
+    ({"a": 1}, {"indent": 2}, '{\n  "a": 1\n}'),
+    ({"n": 2 ** 70}, {}, '{"n": 1180591620717411303424}'),
+], ids=["sort_keys", "indent", "wide_int"])
+def test_json_provider_dumps(obj, kwargs, expected):
+    """Test that the orjson provider honours dumps kwargs and falls back to the stdlib."""
+    assert app.json.dumps(obj, **kwargs) == expected
+
+def test_json_provider_serializes_numpy():
+    """Test that numpy scalars and arrays returned by tools can be serialized."""
+    np = pytest.importorskip("numpy")
+    assert orjson.loads(app.json.dumps({"x": np.float64(1.5), "v": np.array([1, 2])})) == {"x": 1.5, "v": [1, 2]}
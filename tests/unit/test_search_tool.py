@@ -2,30 +2,51 @@
 """
 Unit tests for the search tool functionality.
 """
-import sys
-import os
-import unittest
+import importlib
 from unittest.mock import patch, MagicMock
 import pytest
 
-# Add the backend directory to the path so we can import the tools module
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backend'))
-
 from backend.tools import search, pretty_print_search_results
 
+# backend.tools re-exports the search() function under the submodule's name,
+# so fetch the module itself to patch DDGS on it directly
+search_mod = importlib.import_module("backend.tools.search")
+
+# DDGS is patched per test, so nothing is shared across xdist workers
+pytestmark = [pytest.mark.unit, pytest.mark.tools, pytest.mark.parallel_safe]
+
+# Expected pretty_print_search_results output for the two sample results
+_PRETTY_RESULTS = (
+    "1. Test Result 1\n"
+    "   https://example.com/1\n"
+    "   This is the first test result.\n"
+    "\n"
+    "2. Test Result 2\n"
+    "   https://example.com/2\n"
+    "   This is the second test result.\n"
+)
+
+
+@pytest.fixture(scope="module")
+def _ddgs_template():
+    """Build the DDGS session mock once for the whole module."""
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_instance(_ddgs_template):
+    """Patch DDGS so its context manager yields the freshly reset template."""
+    _ddgs_template.reset_mock(return_value=True, side_effect=True)
+    with patch.object(search_mod, 'DDGS') as mock_ddgs:
+        mock_ddgs.return_value.__enter__.return_value = _ddgs_template
+        yield _ddgs_template
 
-@pytest.mark.unit
-@pytest.mark.tools
-class TestSearchTool(unittest.TestCase):
+
+class TestSearchTool:
     """Test cases for the search tool."""
 
-    @patch('backend.tools.search.DDGS')
-    def test_search_success(self, mock_ddgs):
+    def test_search_success(self, mock_instance):
         """Test that the search tool correctly returns results."""
-        # Set up the mock
-        mock_instance = MagicMock()
-        mock_ddgs.return_value.__enter__.return_value = mock_instance
-
         # Mock search results
         mock_results = [
             {
@@ -45,13 +66,13 @@ class TestSearchTool(unittest.TestCase):
         results = search("test query", max_results=2)
 
         # Verify the results
-        self.assertEqual(len(results), 2)
-        self.assertEqual(results[0]["title"], "Test Result 1")
-        self.assertEqual(results[0]["url"], "https://example.com/1")
-        self.assertEqual(results[0]["snippet"], "This is the first test result.")
-        self.assertEqual(results[1]["title"], "Test Result 2")
-        self.assertEqual(results[1]["url"], "https://example.com/2")
-        self.assertEqual(results[1]["snippet"], "This is the second test result.")
+        assert len(results) == 2
+        assert results[0]["title"] == "Test Result 1"
+        assert results[0]["url"] == "https://example.com/1"
+        assert results[0]["snippet"] == "This is the first test result."
+        assert results[1]["title"] == "Test Result 2"
+        assert results[1]["url"] == "https://example.com/2"
+        assert results[1]["snippet"] == "This is the second test result."
 
         # Verify the mock was called correctly
         mock_instance.text.assert_called_once_with(
@@ -62,13 +83,8 @@ class TestSearchTool(unittest.TestCase):
             max_results=2
         )
 
-    @patch('backend.tools.search.DDGS')
-    def test_search_empty_results(self, mock_ddgs):
+    def test_search_empty_results(self, mock_instance):
         """Test that the search tool handles empty results correctly."""
-        # Set up the mock
-        mock_instance = MagicMock()
-        mock_ddgs.return_value.__enter__.return_value = mock_instance
-
         # Mock empty search results
         mock_instance.text.return_value = []
 
@@ -76,15 +92,10 @@ class TestSearchTool(unittest.TestCase):
         results = search("nonexistent query")
 
         # Verify the results
-        self.assertEqual(len(results), 0)
+        assert len(results) == 0
 
-    @patch('backend.tools.search.DDGS')
-    def test_search_missing_fields(self, mock_ddgs):
+    def test_search_missing_fields(self, mock_instance):
         """Test that the search tool handles results with missing fields."""
-        # Set up the mock
-        mock_instance = MagicMock()
-        mock_ddgs.return_value.__enter__.return_value = mock_instance
-
         # Mock search results with missing fields
         mock_results = [
             {
@@ -109,18 +120,18 @@ class TestSearchTool(unittest.TestCase):
         results = search("test query", max_results=3)
 
         # Verify the results
-        self.assertEqual(len(results), 3)
-        self.assertEqual(results[0]["title"], "<no title>")
-        self.assertEqual(results[0]["url"], "https://example.com/1")
-        self.assertEqual(results[0]["snippet"], "This is the first test result.")
+        assert len(results) == 3
+        assert results[0]["title"] == "<no title>"
+        assert results[0]["url"] == "https://example.com/1"
+        assert results[0]["snippet"] == "This is the first test result."
 
-        self.assertEqual(results[1]["title"], "Test Result 2")
-        self.assertEqual(results[1]["url"], "<no link>")
-        self.assertEqual(results[1]["snippet"], "This is the second test result.")
+        assert results[1]["title"] == "Test Result 2"
+        assert results[1]["url"] == "<no link>"
+        assert results[1]["snippet"] == "This is the second test result."
 
-        self.assertEqual(results[2]["title"], "Test Result 3")
-        self.assertEqual(results[2]["url"], "https://example.com/3")
-        self.assertEqual(results[2]["snippet"], "")
+        assert results[2]["title"] == "Test Result 3"
+        assert results[2]["url"] == "https://example.com/3"
+        assert results[2]["snippet"] == ""
 
     def test_pretty_print_search_results(self):
         """Test that the pretty print function formats search results correctly."""
@@ -138,20 +149,9 @@ class TestSearchTool(unittest.TestCase):
             }
         ]
 
-        formatted = pretty_print_search_results(results)
-
         # Verify the formatting
-        self.assertIn("1. Test Result 1", formatted)
-        self.assertIn("https://example.com/1", formatted)
-        self.assertIn("This is the first test result.", formatted)
-        self.assertIn("2. Test Result 2", formatted)
-        self.assertIn("https://example.com/2", formatted)
-        self.assertIn("This is the second test result.", formatted)
+        assert pretty_print_search_results(results) == _PRETTY_RESULTS
 
         # Test with empty results
         empty_formatted = pretty_print_search_results([])
-        self.assertEqual(empty_formatted, "No results found.")
-
-
-if __name__ == '__main__':
-    unittest.main()
+        assert empty_formatted == "No results found."
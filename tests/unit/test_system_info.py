@@ -1,57 +1,76 @@
 """Unit tests for the system_info module."""
-import unittest
-import os
-import platform
+from unittest.mock import patch, DEFAULT
 import socket
 import re
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+import pytest
 
 from backend.system_info import get_system_info, format_bytes
 
-class TestSystemInfo(unittest.TestCase):
+# Platform details are faked inside this process only, so this is xdist-safe
+pytestmark = pytest.mark.parallel_safe
+
+# Memory and disk lines as rendered by format_bytes
+_TOTAL_RE = re.compile(r"Total: \d+\.\d+ [KMGT]B")
+_AVAILABLE_RE = re.compile(r"Available: \d+\.\d+ [KMGT]B")
+_USED_RE = re.compile(r"Used: \d+\.\d+ [KMGT]B \(\d+\.\d+%\)")
+
+
+@pytest.fixture(scope="module")
+def system_info():
+    """Collect the system info once per module with platform and os details faked."""
+    with patch.multiple('platform', system=DEFAULT, release=DEFAULT, version=DEFAULT,
+                        machine=DEFAULT, processor=DEFAULT, python_version=DEFAULT) as pm, \
+            patch.multiple('os', getlogin=DEFAULT, getcwd=DEFAULT) as om:
+        pm['system'].return_value = "Linux"
+        pm['release'].return_value = "6.1.0"
+        pm['version'].return_value = "#1 SMP"
+        pm['machine'].return_value = "x86_64"
+        pm['processor'].return_value = "x86_64"
+        pm['python_version'].return_value = "3.12.0"
+        om['getlogin'].return_value = "testuser"
+        om['getcwd'].return_value = "/home/testuser"
+        return get_system_info()
+
+
+class TestSystemInfo:
     """Test cases for the system_info module."""
 
-    def test_get_system_info(self):
+    def test_get_system_info(self, system_info):
         """Test that get_system_info returns a properly formatted string with system information."""
-        system_info = get_system_info()
-        
         # Check that the system info is a non-empty string
-        self.assertIsInstance(system_info, str)
-        self.assertTrue(len(system_info) > 0)
+        assert isinstance(system_info, str)
+        assert len(system_info) > 0
         
         # Check that it contains the expected sections
-        self.assertIn("SYSTEM INFORMATION:", system_info)
-        self.assertIn("MEMORY:", system_info)
-        self.assertIn("DISK:", system_info)
+        assert "SYSTEM INFORMATION:" in system_info
+        assert "MEMORY:" in system_info
+        assert "DISK:" in system_info
         
         # Check that it contains the correct OS information
-        self.assertIn(f"OS: {platform.system()}", system_info)
-        self.assertIn(f"Architecture: {platform.machine()}", system_info)
-        self.assertIn(f"Hostname: {socket.gethostname()}", system_info)
+        assert "OS: Linux 6.1.0 #1 SMP" in system_info
+        assert "Architecture: x86_64" in system_info
+        assert f"Hostname: {socket.gethostname()}" in system_info
+        assert "Username: testuser" in system_info
         
         # Check that it contains the Python version
-        self.assertIn(f"Python Version: {platform.python_version()}", system_info)
+        assert "Python Version: 3.12.0" in system_info
         
         # Check that it contains the current directory
-        self.assertIn(f"Current Directory: {os.getcwd()}", system_info)
+        assert "Current Directory: /home/testuser" in system_info
         
         # Check memory and disk information format
-        self.assertTrue(re.search(r"Total: \d+\.\d+ [KMGT]B", system_info))
-        self.assertTrue(re.search(r"Available: \d+\.\d+ [KMGT]B", system_info))
-        self.assertTrue(re.search(r"Used: \d+\.\d+ [KMGT]B \(\d+\.\d+%\)", system_info))
+        assert _TOTAL_RE.search(system_info)
+        assert _AVAILABLE_RE.search(system_info)
+        assert _USED_RE.search(system_info)
 
-    def test_format_bytes(self):
+    @pytest.mark.parametrize("n, expected", [
+        (500, "500.00 B"),
+        (1024, "1.00 KB"),
+        (1024 ** 2, "1.00 MB"),
+        (1024 ** 3, "1.00 GB"),
+        (1024 ** 4, "1.00 TB"),
+        (1536 * 1024, "1.50 MB"),
+    ])
+    def test_format_bytes(self, n, expected):
         """Test the format_bytes function."""
-        # Test various byte values
-        self.assertEqual(format_bytes(500), "500.00 B")
-        self.assertEqual(format_bytes(1024), "1.00 KB")
-        self.assertEqual(format_bytes(1024 * 1024), "1.00 MB")
-        self.assertEqual(format_bytes(1024 * 1024 * 1024), "1.00 GB")
-        self.assertEqual(format_bytes(1024 * 1024 * 1024 * 1024), "1.00 TB")
-        
-        # Test a more complex value
-        self.assertEqual(format_bytes(1536 * 1024), "1.50 MB")
-
-if __name__ == '__main__':
-    unittest.main()
+        assert format_bytes(n) == expected
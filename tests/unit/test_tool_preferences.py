@@ -1,128 +1,121 @@
 """Unit tests for tool preferences functionality."""
-import json
-import unittest
+from unittest.mock import patch
+
+import pytest
 
 from backend.app import app
 
+# Sessions are per-file, the app state lives in each worker process and the
+# chat test stubs out llm_call, so nothing here reaches a shared server
+pytestmark = pytest.mark.parallel_safe
+
+# Sessions touched by these tests; reset after each one so state never leaks
+_SESSIONS = ('test_session', 'test_reset', 'test_chat')
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Shared test client for the whole module."""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def reset_sessions(client):
+    """Reset every session the tests use once each test finishes."""
+    yield
+    for session_id in _SESSIONS:
+        client.post('/api/reset', json={'session_id': session_id})
+
+
+def _get_tools(client, session_id):
+    """Fetch the tool preference dict for a session."""
+    response = client.get(f'/api/tools?session_id={session_id}')
+    return response.get_json()['tools']
+
+
+def _enabled(**overrides):
+    """Every tool enabled, except those overridden."""
+    return {'search': True, 'wiki_search': True, 'get_weather': True, 'calculator': True, **overrides}
 
-class TestToolPreferences(unittest.TestCase):
-    """Test the tool preferences API endpoints and functionality."""
 
-    def setUp(self):
-        """Set up the test client."""
-        self.app = app.test_client()
-        self.app.testing = True
+class TestToolPreferences:
+    """Test the tool preferences API endpoints and functionality."""
 
-    def test_get_tool_preferences_default(self):
+    def test_get_tool_preferences_default(self, client):
         """Test getting default tool preferences."""
-        response = self.app.get('/api/tools?session_id=test_session')
-        self.assertEqual(response.status_code, 200)
+        response = client.get('/api/tools?session_id=test_session')
+        assert response.status_code == 200
 
-        data = json.loads(response.data)
-        self.assertEqual(data['status'], 'success')
-        self.assertIn('tools', data)
+        data = response.get_json()
+        assert data['status'] == 'success'
+        assert 'tools' in data
 
         # All tools should be enabled by default
-        tools = data['tools']
-        self.assertIn('search', tools)
-        self.assertIn('wiki_search', tools)
-        self.assertIn('get_weather', tools)
-        self.assertIn('calculator', tools)
-        self.assertTrue(tools['search'])
-        self.assertTrue(tools['wiki_search'])
-        self.assertTrue(tools['get_weather'])
-        self.assertTrue(tools['calculator'])
-
-    def test_update_tool_preferences(self):
+        assert data['tools'] == _enabled()
+
+    def test_update_tool_preferences(self, client):
         """Test updating tool preferences."""
         # First, disable the search tool
-        response = self.app.post(
+        response = client.post(
             '/api/tools?session_id=test_session',
             json={'tools': {'search': False}}
         )
-        self.assertEqual(response.status_code, 200)
-
-        # Then get the preferences to verify the update
-        response = self.app.get('/api/tools?session_id=test_session')
-        data = json.loads(response.data)
-        tools = data['tools']
+        assert response.status_code == 200
 
         # Search should be disabled, others enabled
-        self.assertFalse(tools['search'])
-        self.assertTrue(tools['wiki_search'])
-        self.assertTrue(tools['get_weather'])
-        self.assertTrue(tools['calculator'])
+        assert _get_tools(client, 'test_session') == _enabled(search=False)
 
         # Update multiple tools
-        response = self.app.post(
+        response = client.post(
             '/api/tools?session_id=test_session',
             json={'tools': {'search': True, 'wiki_search': False}}
         )
-        self.assertEqual(response.status_code, 200)
-
-        # Verify the updates
-        response = self.app.get('/api/tools?session_id=test_session')
-        data = json.loads(response.data)
-        tools = data['tools']
-
-        self.assertTrue(tools['search'])
-        self.assertFalse(tools['wiki_search'])
-        self.assertTrue(tools['get_weather'])
-        self.assertTrue(tools['calculator'])
-
-    def test_reset_conversation_resets_tools(self):
+        assert response.status_code == 200
+        assert _get_tools(client, 'test_session') == _enabled(wiki_search=False)
+
+    @pytest.mark.parametrize("session_id, to_disable", [
+        ('test_reset', ('search', 'wiki_search')),
+        ('test_chat', ('search',)),
+    ])
+    def test_reset_conversation_resets_tools(self, client, session_id, to_disable):
         """Test that resetting a conversation resets tool preferences."""
-        # First, disable some tools
-        self.app.post(
-            '/api/tools?session_id=test_reset',
-            json={'tools': {'search': False, 'wiki_search': False}}
-        )
+        disabled = {name: False for name in to_disable}
 
-        # Verify they're disabled
-        response = self.app.get('/api/tools?session_id=test_reset')
-        data = json.loads(response.data)
-        tools = data['tools']
-        self.assertFalse(tools['search'])
-        self.assertFalse(tools['wiki_search'])
+        # First, disable some tools and check they're off
+        client.post(f'/api/tools?session_id={session_id}', json={'tools': disabled})
+        assert _get_tools(client, session_id) == _enabled(**disabled)
 
         # Reset the conversation
-        self.app.post(
-            '/api/reset',
-            json={'session_id': 'test_reset'}
-        )
+        client.post('/api/reset', json={'session_id': session_id})
 
         # Verify tools are reset to enabled
-        response = self.app.get('/api/tools?session_id=test_reset')
-        data = json.loads(response.data)
-        tools = data['tools']
-        self.assertTrue(tools['search'])
-        self.assertTrue(tools['wiki_search'])
-        self.assertTrue(tools['get_weather'])
-        self.assertTrue(tools['calculator'])
-
-    def test_tool_preferences_in_chat_request(self):
+        assert _get_tools(client, session_id) == _enabled()
+
+    def test_tool_preferences_in_chat_request(self, client):
         """Test that tool preferences are properly handled in chat requests."""
         # Disable the search tool
-        self.app.post(
+        client.post(
             '/api/tools?session_id=test_chat',
             json={'tools': {'search': False}}
         )
 
-        # Send a chat message with tool preferences
-        response = self.app.post(
-            '/api/chat',
-            json={
-                'message': 'Hello',
-                'session_id': 'test_chat',
-                'tool_preferences': {'search': False, 'wiki_search': True}
-            }
-        )
+        # Send a chat message with tool preferences, answered by a canned reply
+        reply = {'role': 'assistant', 'content': 'Hi there!'}
+        with patch('backend.app.llm_call', return_value=reply) as mock_llm_call:
+            response = client.post(
+                '/api/chat',
+                json={
+                    'message': 'Hello',
+                    'session_id': 'test_chat',
+                    'tool_preferences': {'search': False, 'wiki_search': True}
+                }
+            )
+        mock_llm_call.assert_called_once()
 
         # Verify the response is successful
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
-        self.assertIn('messages', data)
-
+        assert response.status_code == 200
+        data = response.get_json()
+        assert 'messages' in data
 
-if __name__ == '__main__':
-    unittest.main()
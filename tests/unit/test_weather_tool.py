@@ -2,165 +2,167 @@
 """
 Unit tests for the weather tool functionality.
 """
-import sys
-import os
-import unittest
-from unittest.mock import patch, MagicMock
-from bs4 import BeautifulSoup
-
-# Add the backend directory to the path so we can import the tools module
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backend'))
+from types import SimpleNamespace
+from unittest.mock import patch
+import pytest
+import requests
 
 from backend.tools import get_weather
-
-
-class TestWeatherTool(unittest.TestCase):
+from backend.tools import weather
+
+# Network access is mocked and the cache is patched per test, so this is xdist-safe
+pytestmark = pytest.mark.parallel_safe
+
+# wttr.in ?format=j1 payloads returned by the mocked session
+_LONDON_JSON = {
+    "nearest_area": [{"areaName": [{"value": "London"}], "country": [{"value": "United Kingdom"}]}],
+    "current_condition": [{
+        "temp_C": "15",
+        "weatherDesc": [{"value": "Cloudy"}],
+        "humidity": "75",
+        "windspeedKmph": "10",
+        "precipMM": "0.2"
+    }],
+    "weather": [{
+        "date": "2026-10-16",
+        "maxtempC": "18",
+        "mintempC": "10",
+        # The tool reads the noon slot, the fifth of eight three-hourly entries
+        "hourly": [{"weatherDesc": [{"value": "Partly cloudy"}]}] * 8
+    }]
+}
+
+# Only an area name and a temperature: everything else falls back to defaults
+_PARIS_JSON = {
+    "nearest_area": [{"areaName": [{"value": "Paris"}]}],
+    "current_condition": [{"temp_C": "22", "weatherDesc": [{"value": "Sunny"}]}]
+}
+
+_OSLO_JSON = {
+    "nearest_area": [{"areaName": [{"value": "Oslo"}], "country": [{"value": "Norway"}]}],
+    "current_condition": [{"temp_C": "4", "weatherDesc": [{"value": "Snow"}]}]
+}
+
+# Expected get_weather results for the payloads above
+_EXPECTED_LONDON = {
+    "status": "success",
+    "data": {
+        "location": "London, United Kingdom",
+        "temperature": "15°C",
+        "condition": "Cloudy",
+        "humidity": "75%",
+        "wind": "10 km/h",
+        "precipitation": "0.2 mm",
+        "forecast": [
+            {"day": "Today", "max_temp": "18°C", "min_temp": "10°C", "condition": "Partly cloudy"}
+        ]
+    }
+}
+
+_EXPECTED_PARIS = {
+    "status": "success",
+    "data": {
+        "location": "Paris",
+        "temperature": "22°C",
+        "condition": "Sunny",
+        "humidity": "N/A",
+        "wind": "N/A",
+        "precipitation": "N/A",
+        "forecast": [{"day": "Today", "max_temp": "22°C", "condition": "Sunny"}]
+    }
+}
+
+# A payload without a temperature is reported as an error
+_EXPECTED_EMPTY = {"status": "error", "message": "Could not extract weather data for 'Nowhere'"}
+
+
+def _canned_response(payload):
+    """Build a cheap stand-in for a successful wttr.in JSON response."""
+    return SimpleNamespace(json=lambda: payload, raise_for_status=lambda: None)
+
+
+class TestWeatherTool:
     """Test cases for the weather tool."""
 
-    @patch('requests.get')
-    def test_weather_tool_success(self, mock_get):
-        """Test that the weather tool correctly extracts data when HTML structure is as expected."""
-        # Create mock responses for the initial search and city page
-        search_response = MagicMock()
-        search_response.text = """
-        <html>
-            <body>
-                <table class="table-striped">
-                    <tbody>
-                        <tr>
-                            <td><a href="/city/2643743">London, GB</a></td>
-                        </tr>
-                    </tbody>
-                </table>
-            </body>
-        </html>
-        """
-        search_response.raise_for_status = MagicMock()
-
-        city_response = MagicMock()
-        city_response.text = """
-        <html>
-            <body>
-                <h2>London, GB</h2>
-                <div class="current-container">
-                    <div class="heading">15.2°C</div>
-                    <div>Cloudy</div>
-                    <span class="bold">Humidity:</span> 75%
-                    <span class="bold">Wind:</span> 10 km/h
-                    <span class="bold">Rain:</span> 20%
-                </div>
-                <div class="day-list">
-                    <div class="day-list__item">
-                        <div class="day-list__item__date">Mon</div>
-                        <div class="day-list__item__temp">18°C</div>
-                        <div class="day-list__item__temp">10°C</div>
-                        <div class="day-list__item__condition">Partly Cloudy</div>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-        city_response.raise_for_status = MagicMock()
-
-        # Configure mock to return different responses for different URLs
-        def get_side_effect(url, **kwargs):
-            if "find" in url:
-                return search_response
-            else:
-                return city_response
-
-        mock_get.side_effect = get_side_effect
-
-        # Call the function
-        result = get_weather("London")
-
-        # Verify the result
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["data"]["location"], "London, GB")
-        self.assertEqual(result["data"]["temperature"], "15.2°C")
-        self.assertEqual(result["data"]["condition"], "Cloudy")
-        self.assertEqual(result["data"]["precipitation"], "20%")
-        self.assertEqual(result["data"]["humidity"], "75%")
-        self.assertEqual(result["data"]["wind"], "10 km/h")
-        self.assertEqual(len(result["data"]["forecast"]), 1)
-        self.assertEqual(result["data"]["forecast"][0]["day"], "Mon")
-        self.assertEqual(result["data"]["forecast"][0]["max_temp"], "18°C")
-        self.assertEqual(result["data"]["forecast"][0]["min_temp"], "10°C")
-        self.assertEqual(result["data"]["forecast"][0]["condition"], "Partly Cloudy")
-
-    @patch('requests.get')
-    def test_weather_tool_alternative_selectors(self, mock_get):
-        """Test that the weather tool uses alternative selectors when primary ones fail."""
-        # Create a mock response with weather widget structure
-        mock_response = MagicMock()
-        mock_response.text = """
-        <html>
-            <body>
-                <div class="weather-widget">
-                    <div class="weather-widget__city-name">Paris, France</div>
-                    <div class="weather-widget__temperature">22°C</div>
-                    <div class="weather-widget__description">Sunny</div>
-                    <div class="weather-widget__item">
-                        <div class="weather-widget__item-label">Humidity</div>
-                        <div class="weather-widget__item-value">60%</div>
-                    </div>
-                    <div class="weather-widget__item">
-                        <div class="weather-widget__item-label">Wind</div>
-                        <div class="weather-widget__item-value">5 km/h</div>
-                    </div>
-                    <div class="weather-widget__item">
-                        <div class="weather-widget__item-label">Rain</div>
-                        <div class="weather-widget__item-value">10%</div>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
-
-        # Call the function
-        result = get_weather("Paris")
-
-        # Verify the result
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["data"]["location"], "Paris, France")
-        self.assertEqual(result["data"]["temperature"], "22°C")
-        self.assertEqual(result["data"]["condition"], "Sunny")
-        self.assertEqual(result["data"]["humidity"], "60%")
-        self.assertEqual(result["data"]["wind"], "5 km/h")
-        self.assertEqual(result["data"]["precipitation"], "10%")
-
-    @patch('requests.get')
-    def test_weather_tool_error_handling(self, mock_get):
+    @pytest.mark.parametrize("location, payload, expected", [
+        ("London", _LONDON_JSON, _EXPECTED_LONDON),
+        ("Paris", _PARIS_JSON, _EXPECTED_PARIS),
+        ("Nowhere", {}, _EXPECTED_EMPTY),
+    ], ids=["full", "minimal", "empty"])
+    def test_weather_tool_parses_payload(self, location, payload, expected):
+        """Test that the weather tool extracts data from full, minimal and empty wttr.in payloads."""
+        with patch.dict(weather.WEATHER_CACHE, clear=True), \
+                patch.object(weather._SESSION, "get", return_value=_canned_response(payload)) as mock_get:
+            assert get_weather(location) == expected
+
+        mock_get.assert_called_once()
+        assert mock_get.call_args.args[0] == f"https://wttr.in/{location}?format=j1"
+
+    def test_weather_tool_error_handling(self):
         """Test that the weather tool handles errors gracefully."""
         # Make the request raise an exception
-        mock_get.side_effect = Exception("Connection error")
-
-        # Call the function
-        result = get_weather("Invalid Location")
-
-        # Verify the result
-        self.assertEqual(result["status"], "error")
-        self.assertTrue("Error fetching weather data" in result["message"])
-
-    @patch('requests.get')
-    def test_weather_tool_empty_response(self, mock_get):
-        """Test that the weather tool handles empty responses gracefully."""
-        # Create a mock response with empty HTML
-        mock_response = MagicMock()
-        mock_response.text = "<html><body></body></html>"
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
-
-        # Call the function
-        result = get_weather("Empty")
+        with patch.dict(weather.WEATHER_CACHE, clear=True), \
+                patch.object(weather._SESSION, "get",
+                             side_effect=requests.ConnectionError("Connection error")) as mock_get:
+            result = get_weather("Berlin")
 
         # Verify the result
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["data"]["location"], "Empty")
-        # No other data should be present except location
-
+        mock_get.assert_called_once()
+        assert result == {
+            "status": "error",
+            "message": "Error processing weather data: Connection error"
+        }
+
+    def test_get_weather_caches_until_expiry(self):
+        """Test that repeat lookups hit the cache until the entry expires."""
+        scraped = {"status": "success", "data": {"location": "New York"}}
+        expired = weather.CACHE_EXPIRATION + 1
+
+        with patch.dict(weather.WEATHER_CACHE, clear=True), \
+                patch.object(weather, "scrape_weather", return_value=scraped) as mock_scrape, \
+                patch.object(weather, "_now", side_effect=[0, 1, expired, expired]):
+            assert get_weather("New York") == scraped
+            assert get_weather(" new york") == scraped
+            assert mock_scrape.call_count == 1
+            assert get_weather("New York") == scraped
+            assert mock_scrape.call_count == 2
+
+    def test_session_retries_transient_errors(self):
+        """Test that the shared session retries rate limits and server errors."""
+        retry = weather._SESSION.get_adapter("https://wttr.in").max_retries
+        assert retry.total == 2
+        assert 503 in retry.status_forcelist
+        assert 404 not in retry.status_forcelist
+        assert not retry.respect_retry_after_header
+        # Exhausted retries hand back the last response instead of raising RetryError
+        assert not retry.raise_on_status
+
+    def test_weather_tool_server_error(self):
+        """Test that a 5xx left over after the retries is reported via raise_for_status."""
+        response = requests.Response()
+        response.status_code = 503
+        response.reason = "Service Unavailable"
+        response.url = "https://wttr.in/Berlin?format=j1"
+
+        with patch.dict(weather.WEATHER_CACHE, clear=True), \
+                patch.object(weather._SESSION, "get", return_value=response) as mock_get:
+            result = get_weather("Berlin")
+
+        mock_get.assert_called_once()
+        assert result == {
+            "status": "error",
+            "message": "Location 'Berlin' not found: 503 Server Error: Service Unavailable "
+                       "for url: https://wttr.in/Berlin?format=j1"
+        }
+
+    def test_scrape_weather_uses_shared_session(self):
+        """Test that scraping goes through the module's keep-alive session."""
+        with patch.object(weather._SESSION, "get", return_value=_canned_response(_OSLO_JSON)) as mock_get:
+            result = weather.scrape_weather("Oslo")
+
+        mock_get.assert_called_once()
+        assert mock_get.call_args.kwargs["timeout"] == weather._TIMEOUT
+        assert result["status"] == "success"
+        assert result["data"]["location"] == "Oslo, Norway"
+        assert result["data"]["temperature"] == "4°C"
 
-if __name__ == '__main__':
-    unittest.main()
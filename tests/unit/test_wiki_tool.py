@@ -2,182 +2,170 @@
 """
 Unit tests for the Wikipedia search tool functionality.
 """
-import sys
-import os
-import unittest
-from unittest.mock import patch, MagicMock
+from collections import namedtuple
+from functools import partial
+from types import SimpleNamespace
+from unittest.mock import patch, call, Mock, DEFAULT
 import pytest
-
-# Add the backend directory to the path so we can import the tools module
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backend'))
+import wikipedia
+from wikipedia.exceptions import DisambiguationError
 
 from backend.tools import wiki_search, pretty_print_wiki_results
 
 
-@pytest.mark.unit
-@pytest.mark.tools
-class TestWikiTool(unittest.TestCase):
-    """Test cases for the Wikipedia search tool."""
-
-    @patch('backend.tools.wiki.wikipedia.search')
-    @patch('backend.tools.wiki.wikipedia.page')
-    @patch('backend.tools.wiki.wikipedia.summary')
-    def test_wiki_search_success(self, mock_summary, mock_page, mock_search):
-        """Test that the wiki search tool correctly returns results."""
-        # Set up the mocks
-        mock_search.return_value = ["Python (programming language)", "Python (mythology)"]
+# The two Python pages the mocked wikipedia module knows about
+TITLE_PY_LANG = "Python (programming language)"
+TITLE_PY_MYTH = "Python (mythology)"
+URL_PY_LANG = "https://en.wikipedia.org/wiki/Python_(programming_language)"
+URL_PY_MYTH = "https://en.wikipedia.org/wiki/Python_(mythology)"
+SUMMARY_PY_LANG = "Python is a high-level programming language."
+SUMMARY_PY_MYTH = "In Greek mythology, Python was a serpent."
 
-        mock_page1 = MagicMock()
-        mock_page1.title = "Python (programming language)"
-        mock_page1.url = "https://en.wikipedia.org/wiki/Python_(programming_language)"
+# The wiki_search result entries for those pages
+_RESULT_PY_LANG = {"title": TITLE_PY_LANG, "url": URL_PY_LANG, "summary": SUMMARY_PY_LANG}
+_RESULT_PY_MYTH = {"title": TITLE_PY_MYTH, "url": URL_PY_MYTH, "summary": SUMMARY_PY_MYTH}
 
-        mock_page2 = MagicMock()
-        mock_page2.title = "Python (mythology)"
-        mock_page2.url = "https://en.wikipedia.org/wiki/Python_(mythology)"
 
-        # Make mock_page return different values based on input
-        def get_page(title, **kwargs):
-            if title == "Python (programming language)":
-                return mock_page1
-            elif title == "Python (mythology)":
-                return mock_page2
-            raise ValueError(f"Unexpected title: {title}")
+def _lookup(table, title, sentences=None, auto_suggest=False):
+    """Mock side effect: answer a wikipedia.page/summary call from a title-keyed dict."""
+    return table[title]
 
-        mock_page.side_effect = get_page
 
-        # Make mock_summary return different values based on input
-        def get_summary(title, **kwargs):
-            if title == "Python (programming language)":
-                return "Python is a high-level programming language."
-            elif title == "Python (mythology)":
-                return "In Greek mythology, Python was a serpent."
-            raise ValueError(f"Unexpected title: {title}")
+# Stand-ins for the pages wikipedia.page() returns
+_PAGE_PY_LANG = Mock(spec_set=["title", "url"], title=TITLE_PY_LANG, url=URL_PY_LANG)
+_PAGE_PY_MYTH = Mock(spec_set=["title", "url"], title=TITLE_PY_MYTH, url=URL_PY_MYTH)
 
-        mock_summary.side_effect = get_summary
+_PAGES = {TITLE_PY_LANG: _PAGE_PY_LANG, TITLE_PY_MYTH: _PAGE_PY_MYTH}
+_SUMMARIES = {TITLE_PY_LANG: SUMMARY_PY_LANG, TITLE_PY_MYTH: SUMMARY_PY_MYTH}
 
-        # Call the function
-        result = wiki_search("Python", max_results=2, sentences=1)
 
-        # Verify the result
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["query"], "Python")
-        self.assertEqual(len(result["results"]), 2)
+# One wiki_search call: its arguments, what the mocks return and the expected result.
+# make_page_effect builds the wikipedia.page side effect afresh for every run, so
+# no exception instance (and its traceback) is shared between tests.
+WikiScenario = namedtuple("WikiScenario", "query kwargs search_results make_page_effect expected")
 
-        self.assertEqual(result["results"][0]["title"], "Python (programming language)")
-        self.assertEqual(result["results"][0]["url"], "https://en.wikipedia.org/wiki/Python_(programming_language)")
-        self.assertEqual(result["results"][0]["summary"], "Python is a high-level programming language.")
-
-        self.assertEqual(result["results"][1]["title"], "Python (mythology)")
-        self.assertEqual(result["results"][1]["url"], "https://en.wikipedia.org/wiki/Python_(mythology)")
-        self.assertEqual(result["results"][1]["summary"], "In Greek mythology, Python was a serpent.")
-
-        # Verify the mocks were called correctly
-        mock_search.assert_called_once_with("Python", results=2)
-        mock_page.assert_any_call("Python (programming language)", auto_suggest=False)
-        mock_page.assert_any_call("Python (mythology)", auto_suggest=False)
-        mock_summary.assert_any_call("Python (programming language)", sentences=1, auto_suggest=False)
-        mock_summary.assert_any_call("Python (mythology)", sentences=1, auto_suggest=False)
-
-    @patch('backend.tools.wiki.wikipedia.search')
-    def test_wiki_search_no_results(self, mock_search):
-        """Test that the wiki search tool handles no results correctly."""
-        # Set up the mock
-        mock_search.return_value = []
-
-        # Call the function
-        result = wiki_search("NonexistentTopic")
-
-        # Verify the result
-        self.assertEqual(result["status"], "no_results")
-        self.assertIn("No Wikipedia results found", result["message"])
-
-        # Verify the mock was called correctly
-        mock_search.assert_called_once_with("NonexistentTopic", results=3)
-
-    @patch('backend.tools.wiki.wikipedia.search')
-    @patch('backend.tools.wiki.wikipedia.page')
-    @patch('backend.tools.wiki.wikipedia.summary')
-    def test_wiki_search_with_exceptions(self, mock_summary, mock_page, mock_search):
-        """Test that the wiki search tool handles exceptions correctly."""
-        # Set up the mocks
-        mock_search.return_value = ["Python (programming language)", "Python (mythology)"]
-
-        # Make mock_page raise an exception for the second title
-        def get_page(title, **kwargs):
-            if title == "Python (programming language)":
-                mock_result = MagicMock()
-                mock_result.title = "Python (programming language)"
-                mock_result.url = "https://en.wikipedia.org/wiki/Python_(programming_language)"
-                return mock_result
-            elif title == "Python (mythology)":
-                from wikipedia.exceptions import DisambiguationError
-                raise DisambiguationError("Python", ["Python (snake)", "Monty Python"])
-            raise ValueError(f"Unexpected title: {title}")
-
-        mock_page.side_effect = get_page
-
-        # Make mock_summary return a value for the first title
-        mock_summary.return_value = "Python is a high-level programming language."
-
-        # Call the function
-        result = wiki_search("Python", max_results=2)
-
-        # Verify the result
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["query"], "Python")
-        self.assertEqual(len(result["results"]), 1)  # Only one result should be returned
-
-        self.assertEqual(result["results"][0]["title"], "Python (programming language)")
-        self.assertEqual(result["results"][0]["url"], "https://en.wikipedia.org/wiki/Python_(programming_language)")
-        self.assertEqual(result["results"][0]["summary"], "Python is a high-level programming language.")
-
-    def test_pretty_print_wiki_results(self):
-        """Test that the pretty print function formats wiki results correctly."""
-        # Test with normal results
-        result = {
+_WIKI_SCENARIOS = [
+    WikiScenario(
+        query="Python",
+        kwargs={"max_results": 2, "sentences": 1},
+        search_results=[TITLE_PY_LANG, TITLE_PY_MYTH],
+        make_page_effect=lambda: partial(_lookup, _PAGES),
+        expected={
             "status": "success",
             "query": "Python",
-            "results": [
-                {
-                    "title": "Python (programming language)",
-                    "url": "https://en.wikipedia.org/wiki/Python_(programming_language)",
-                    "summary": "Python is a high-level programming language."
-                },
-                {
-                    "title": "Python (mythology)",
-                    "url": "https://en.wikipedia.org/wiki/Python_(mythology)",
-                    "summary": "In Greek mythology, Python was a serpent."
-                }
-            ]
-        }
-
-        formatted = pretty_print_wiki_results(result)
-
-        # Verify the formatting
-        self.assertIn("Wikipedia results for 'Python'", formatted)
-        self.assertIn("1. Python (programming language)", formatted)
-        self.assertIn("https://en.wikipedia.org/wiki/Python_(programming_language)", formatted)
-        self.assertIn("Python is a high-level programming language.", formatted)
-        self.assertIn("2. Python (mythology)", formatted)
-
-        # Test with error status
-        error_result = {
-            "status": "error",
-            "message": "An error occurred"
-        }
-
-        error_formatted = pretty_print_wiki_results(error_result)
-        self.assertEqual(error_formatted, "An error occurred")
-
-        # Test with no results
-        no_results = {
+            "results": [_RESULT_PY_LANG, _RESULT_PY_MYTH]
+        },
+    ),
+    WikiScenario(
+        query="NonexistentTopic",
+        kwargs={},
+        search_results=[],
+        make_page_effect=lambda: None,
+        expected={
             "status": "no_results",
             "message": "No Wikipedia results found for 'NonexistentTopic'"
-        }
+        },
+    ),
+    # Disambiguation pages are skipped, so only one result comes back
+    WikiScenario(
+        query="Python",
+        kwargs={"max_results": 2},
+        search_results=[TITLE_PY_LANG, TITLE_PY_MYTH],
+        # Pages are fetched in search order; the mythology title is ambiguous
+        make_page_effect=lambda: [
+            _PAGE_PY_LANG,
+            DisambiguationError("Python", ["Python (snake)", "Monty Python"]),
+        ],
+        expected={
+            "status": "success",
+            "query": "Python",
+            "results": [_RESULT_PY_LANG]
+        },
+    ),
+]
+
+# pretty_print_wiki_results inputs for each status
+_PRETTY_SUCCESS_INPUT = {
+    "status": "success",
+    "query": "Python",
+    "results": [_RESULT_PY_LANG, _RESULT_PY_MYTH]
+}
+
+_PRETTY_ERROR_INPUT = {
+    "status": "error",
+    "message": "An error occurred"
+}
+
+_PRETTY_EMPTY_INPUT = {
+    "status": "no_results",
+    "message": "No Wikipedia results found for 'NonexistentTopic'"
+}
+
+# Expected pretty_print_wiki_results output for the two Python pages
+_PRETTY_PYTHON_RESULTS = (
+    "Wikipedia results for 'Python':\n"
+    "\n"
+    "1. Python (programming language)\n"
+    "   https://en.wikipedia.org/wiki/Python_(programming_language)\n"
+    "   Python is a high-level programming language.\n"
+    "\n"
+    "2. Python (mythology)\n"
+    "   https://en.wikipedia.org/wiki/Python_(mythology)\n"
+    "   In Greek mythology, Python was a serpent.\n"
+)
+
+
+# Built once at import and entered by the class fixture below
+_WIKI_PATCH = patch.multiple(wikipedia, search=DEFAULT, page=DEFAULT, summary=DEFAULT)
+
+
+@pytest.fixture(scope="class")
+def _wiki_patches():
+    """Patch wikipedia.search/page/summary once for the whole test class."""
+    with _WIKI_PATCH as mocks:
+        yield SimpleNamespace(**mocks)
+
+
+@pytest.fixture
+def wiki_mocks(_wiki_patches):
+    """Hand each test the class-wide mocks with state from earlier tests cleared."""
+    for mock in vars(_wiki_patches).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    return _wiki_patches
+
+
+@pytest.mark.unit
+@pytest.mark.tools
+class TestWikiTool:
+    """Test cases for the Wikipedia search tool."""
 
-        no_results_formatted = pretty_print_wiki_results(no_results)
-        self.assertEqual(no_results_formatted, "No Wikipedia results found for 'NonexistentTopic'")
+    @pytest.mark.parametrize("scenario", _WIKI_SCENARIOS, ids=["success", "empty", "disambig"])
+    def test_wiki_search(self, wiki_mocks, scenario):
+        """Test wiki_search results for found, missing and ambiguous pages."""
+        # Set up the mocks
+        wiki_mocks.search.return_value = scenario.search_results
+        wiki_mocks.page.side_effect = scenario.make_page_effect()
+        wiki_mocks.summary.side_effect = partial(_lookup, _SUMMARIES)
 
+        # Call the function and verify the result
+        result = wiki_search(scenario.query, **scenario.kwargs)
+        assert result == scenario.expected
 
-if __name__ == '__main__':
-    unittest.main()
+        # Verify the mocks were called correctly
+        sentences = scenario.kwargs.get("sentences", 3)
+        wiki_mocks.search.assert_called_once_with(
+            scenario.query, results=scenario.kwargs.get("max_results", 3))
+        wiki_mocks.page.assert_has_calls(
+            [call(title, auto_suggest=False) for title in scenario.search_results], any_order=True)
+        wiki_mocks.summary.assert_has_calls(
+            [call(page["title"], sentences=sentences, auto_suggest=False)
+             for page in result.get("results", [])], any_order=True)
+
+    @pytest.mark.parametrize("payload, expected", [
+        (_PRETTY_SUCCESS_INPUT, _PRETTY_PYTHON_RESULTS),
+        (_PRETTY_ERROR_INPUT, "An error occurred"),
+        (_PRETTY_EMPTY_INPUT, "No Wikipedia results found for 'NonexistentTopic'"),
+    ], ids=["success", "error", "empty"])
+    def test_pretty_print_wiki_results(self, payload, expected):
+        """Test that the pretty print function formats wiki results correctly."""
+        assert pretty_print_wiki_results(payload) == expected